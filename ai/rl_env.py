@@ -4,40 +4,20 @@ import numpy as np
 import pygame # Für Konstanten und ggf. interne Spielinstanz
 import sys
 import os
-import importlib.util
 
-# Importiere dein Spiel oder die relevanten Teile
-# Du musst main_game.py so anpassen, dass es als Modul importiert werden kann
-# und eine Klasse oder Funktionen bereitstellt, um das Spiel zu steuern/abzufragen.
-# Beispiel: from main_game import SoccerGameInstance, PLAYER_RADIUS, BALL_RADIUS etc.
-# Für dieses Beispiel tue ich so, als gäbe es eine solche Klasse:
+# Die Physik kommt aus der headless SoccerSim-Engine im Hauptverzeichnis
 current_dir = os.path.dirname(os.path.abspath(__file__))
-core_dir = os.path.join(os.path.dirname(current_dir), 'core')
-sys.path.insert(0, core_dir)
-
-# Import des space-ball Moduls mit importlib wegen Bindestrich im Namen
-space_ball_path = os.path.join(core_dir, 'space-ball.py')
-spec = importlib.util.spec_from_file_location("space_ball", space_ball_path)
-space_ball = importlib.util.module_from_spec(spec)
-sys.modules["space_ball"] = space_ball
-spec.loader.exec_module(space_ball)
-
-# Import der Spiel-Komponenten
-Player = space_ball.Player
-Ball = space_ball.Ball
-SCREEN_WIDTH = space_ball.SCREEN_WIDTH
-SCREEN_HEIGHT = space_ball.SCREEN_HEIGHT
-TRIBUNE_HEIGHT = space_ball.TRIBUNE_HEIGHT
-PLAYER_RADIUS = space_ball.PLAYER_RADIUS
-BALL_RADIUS = space_ball.BALL_RADIUS
-GOAL_WIDTH = space_ball.GOAL_WIDTH
-GOAL_HEIGHT = space_ball.GOAL_HEIGHT
-DEFAULT_P1_COLOR = space_ball.DEFAULT_P1_COLOR
-DEFAULT_P2_COLOR = space_ball.DEFAULT_P2_COLOR
-Particle = space_ball.Particle
-emit_particles = space_ball.emit_particles
-update_and_draw_particles = space_ball.update_and_draw_particles
-particles = space_ball.particles
+root_dir = os.path.dirname(current_dir)
+sys.path.insert(0, root_dir)
+
+import visuals
+from sprites import SimSprites
+from grid_observation import GridRasterizer, FrameStack
+from simulation import (
+    SoccerSim, EVENT_GOAL, EVENT_KICK,
+    SCREEN_WIDTH, SCREEN_HEIGHT, TRIBUNE_HEIGHT, PLAYER_RADIUS, BALL_RADIUS,
+    GOAL_WIDTH, GOAL_HEIGHT, FIELD_CENTER_Y,
+)
 
 # --- Konstanten für RL ---
 # Definiere die Aktionen, die der Agent ausführen kann
@@ -50,15 +30,59 @@ ACTION_ROTATE_RIGHT = 3
 
 MAX_STEPS_PER_EPISODE = 2500 # Verhindert Endlos-Episoden
 
+def build_observation(agent, opponent, ball):
+    """Normalisierter Zustand aus Sicht des Agenten (rechte Seite, Gegner links)"""
+    p2 = agent
+    b = ball
+    p1 = opponent # Gegner
+
+    obs = np.array([
+        p2.pos.x / SCREEN_WIDTH,
+        (p2.pos.y - TRIBUNE_HEIGHT) / (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT), # Normalisiere y relativ zum Spielfeld
+        np.cos(np.radians(p2.angle)),
+        np.sin(np.radians(p2.angle)),
+        b.pos.x / SCREEN_WIDTH,
+        (b.pos.y - TRIBUNE_HEIGHT) / (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT),
+        b.velocity.x / (p2.sprint_speed * 1.5), # Annahme max Ball Speed
+        b.velocity.y / (p2.sprint_speed * 1.5),
+        p1.pos.x / SCREEN_WIDTH, # Gegnerinfo
+        (p1.pos.y - TRIBUNE_HEIGHT) / (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT)
+        # Füge ggf. mehr hinzu: p1 Winkel, relative Distanzen/Winkel etc.
+    ], dtype=np.float32)
+    return np.clip(obs, -1.0, 1.0) # Sicherstellen, dass Werte im Bereich bleiben
+
 class SoccerEnv(gym.Env):
     metadata = {'render_modes': ['human', 'rgb_array'], 'render_fps': 60}
 
-    def __init__(self, render_mode=None):
+    def __init__(self, render_mode=None, render_size=None, reuse_frame_buffer=False,
+                 observation_mode="vector", grid_size=(84, 84), frame_stack=4):
         super().__init__()
 
         self.render_mode = render_mode
         self.screen = None
         self.clock = None
+        self.sprites = None
+        # rgb_array: render_size=(Breite, Höhe) skaliert die Frames herunter. render()
+        # liefert eine Kopie des Frame-Puffers. Mit reuse_frame_buffer=True entfällt die
+        # Kopie: render() gibt jedes Mal dasselbe Array zurück, das der nächste render()
+        # überschreibt - nur für Aufrufer, die den Frame sofort verbrauchen.
+        self.render_size = tuple(render_size) if render_size is not None else None
+        self.reuse_frame_buffer = reuse_frame_buffer
+        self.scaled_screen = None
+        self.frame = None
+        # observation_mode="grid": Beobachtung ist ein Stapel der letzten frame_stack
+        # Belegungsgitter (frame_stack * len(CHANNELS), Höhe, Breite) uint8, ohne pygame
+        # gerastert (grid_observation.py). Intern ist der Stapel eine Sicht in den Ring;
+        # zurückgegeben wird eine Kopie, damit gespeicherte Beobachtungen gültig bleiben.
+        if observation_mode not in ("vector", "grid"):
+            raise ValueError(f"Unbekannter observation_mode: {observation_mode}")
+        self.observation_mode = observation_mode
+        self.rasterizer = None
+        self.frame_stack = None
+        if observation_mode == "grid":
+            width, height = grid_size
+            self.rasterizer = GridRasterizer(width, height)
+            self.frame_stack = FrameStack(1, self.rasterizer.shape, frame_stack)
 
         # Definiere den Aktionsraum (Beispiel mit 4 diskreten Aktionen)
         self.action_space = spaces.Discrete(4) # 0: Idle, 1: Sprint, 2: Rotate Left, 3: Rotate Right
@@ -98,63 +122,55 @@ class SoccerEnv(gym.Env):
         # Wichtig: Winkel als cos/sin für Kontinuität
         num_obs_features = 10 # (P2_x, P2_y, P2_cos, P2_sin, Ball_x, Ball_y, Ball_vx, Ball_vy, P1_x, P1_y)
         self.observation_space = spaces.Box(low=-1.0, high=1.0, shape=(num_obs_features,), dtype=np.float32)
+        if self.frame_stack is not None:
+            self.observation_space = spaces.Box(low=0, high=255, shape=self.frame_stack.observation_shape[1:], dtype=np.uint8)
 
 
         # Spielinstanz initialisieren
-        self._init_game_state()
+        self._init_game_state(None)
         self.current_step = 0
 
 
-    def _init_game_state(self):
-        # Hier wird dein Pygame-Spiel initialisiert oder zurückgesetzt
-        # Erstelle Spieler, Ball etc.
-        # Verwende die Logik aus deinem `reset_positions` und `start_new_game` (ohne Zeit)
-        self.player1 = Player(SCREEN_WIDTH * 0.25, self._field_center_y(), DEFAULT_P1_COLOR, pygame.K_a, 0)
-        self.agent_player = Player(SCREEN_WIDTH * 0.75, self._field_center_y(), DEFAULT_P2_COLOR, -1, 180) # -1 da keine Taste
-        self.ball = Ball(SCREEN_WIDTH / 2, self._field_center_y())
-        
+    def _init_game_state(self, seed):
+        # Neue Simulation mit Anstoßpositionen, ohne Partikel-Effekte
+        # Mit seed läuft die Episode deterministisch (inkl. Checksumme in info)
+        dt = 1.0 / self.metadata['render_fps'] # Wichtig für konsistente Physik
+        self.sim = SoccerSim(dt=dt, seed=seed)
+        self.player1 = self.sim.player1
+        self.agent_player = self.sim.player2
+        self.ball = self.sim.ball
+
         self.score_agent = 0
         self.score_opponent = 0
-        particles.clear() # Partikel zurücksetzen
-
-        # Wichtig: Spieler 1 (Gegner) braucht eine Logik.
-        # Fürs Erste: Steht still oder einfache Heuristik
-        # from bot_logic import get_bot_decision # Falls du den Bot als Gegner willst
+        visuals.clear_particles() # Partikel zurücksetzen
 
     def _field_center_y(self):
-        return TRIBUNE_HEIGHT + (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT) / 2
+        return FIELD_CENTER_Y
 
-    def _get_obs(self):
-        # Sammle den aktuellen Zustand und normalisiere ihn
-        p2 = self.agent_player
-        b = self.ball
-        p1 = self.player1 # Gegner
-
-        obs = np.array([
-            p2.pos.x / SCREEN_WIDTH,
-            (p2.pos.y - TRIBUNE_HEIGHT) / (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT), # Normalisiere y relativ zum Spielfeld
-            np.cos(np.radians(p2.angle)),
-            np.sin(np.radians(p2.angle)),
-            b.pos.x / SCREEN_WIDTH,
-            (b.pos.y - TRIBUNE_HEIGHT) / (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT),
-            b.velocity.x / (self.agent_player.sprint_speed * 1.5), # Annahme max Ball Speed
-            b.velocity.y / (self.agent_player.sprint_speed * 1.5),
-            p1.pos.x / SCREEN_WIDTH, # Gegnerinfo
-            (p1.pos.y - TRIBUNE_HEIGHT) / (SCREEN_HEIGHT - 2 * TRIBUNE_HEIGHT)
-            # Füge ggf. mehr hinzu: p1 Winkel, relative Distanzen/Winkel etc.
-        ], dtype=np.float32)
-        return np.clip(obs, -1.0, 1.0) # Sicherstellen, dass Werte im Bereich bleiben
+    def _get_obs(self, reset=False):
+        if self.frame_stack is not None:
+            self.frame_stack.push(self._rasterize)
+            if reset:
+                self.frame_stack.fill() # Stapel beginnt mit lauter Kopien des ersten Frames
+            return self.frame_stack.stacked()[0].copy()
+        return build_observation(self.agent_player, self.player1, self.ball)
+
+    def _rasterize(self, out):
+        self.rasterizer.render_sim(self.sim, out)
 
     def _get_info(self):
         # Optionale Debug-Infos
-        return {"agent_score": self.score_agent, "opponent_score": self.score_opponent}
+        info = {"agent_score": self.score_agent, "opponent_score": self.score_opponent}
+        if self.sim.deterministic:
+            info["checksum"] = self.sim.checksum
+        return info
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed) # Wichtig für Reproduzierbarkeit
-        self._init_game_state()
+        self._init_game_state(seed)
         self.current_step = 0
         
-        observation = self._get_obs()
+        observation = self._get_obs(reset=True)
         info = self._get_info()
         
         if self.render_mode == "human":
@@ -197,76 +213,26 @@ class SoccerEnv(gym.Env):
             if self.player1.is_sprinting: self.player1.stop_sprint()
 
 
-        # 3. Spielphysik aktualisieren (dt simulieren)
-        # Normalerweise würde man hier die update-Methoden der Spielobjekte aufrufen
-        # mit einem festen dt, z.B. 1.0 / self.metadata['render_fps']
-        dt = 1.0 / self.metadata['render_fps'] # Wichtig für konsistente Physik
-        
-        self.agent_player.update(dt, None) # None für keys, da wir direkt steuern
-        self.player1.update(dt, None)     # P1 wird hier rudimentär gesteuert
-        self.ball.update(dt)
-        
-        # Partikel (optional, wenn sie den State oder Reward beeinflussen sollen)
-        # update_and_draw_particles(dt, None) # 'None' für surface, da wir hier nicht rendern müssen
-        
-        # 4. Kollisionen und Spielregeln
-        # Ball-Spieler Kollision
-        players = pygame.sprite.Group(self.player1, self.agent_player)
-        collided_players = pygame.sprite.spritecollide(self.ball, players, False, pygame.sprite.collide_circle)
-        agent_kicked_ball = False
-        for player in collided_players:
-            distance_vec = self.ball.pos - player.pos; distance = distance_vec.length()
-            if distance == 0: collision_normal = pygame.Vector2(1, 0)
-            else: collision_normal = distance_vec.normalize()
-
-            if player.is_sprinting:
-                kick_speed = player.sprint_speed * 1.1 # BALL_KICK_MULTIPLIER
-                self.ball.velocity = collision_normal * kick_speed
-                if player == self.agent_player: # Agent hat gekickt
-                    agent_kicked_ball = True
-                    # emit_particles(8, self.ball.pos, (255,255,100)) # Optional
-            else:
-                self.ball.velocity += collision_normal * 50 # Sanfter Stoß
-
-            overlap = (player.radius + self.ball.radius) - distance
-            if overlap > 0.1:
-                 correction_vec = collision_normal * overlap
-                 self.ball.pos += correction_vec * 0.51
-                 player.pos -= correction_vec * 0.5
-                 self.ball.rect.center = self.ball.pos
-                 player.rect.center = player.pos
-        
-        # Spieler-Spieler Kollision (vereinfacht)
-        if pygame.sprite.collide_circle(self.player1, self.agent_player):
-             dist_vec = self.agent_player.pos - self.player1.pos
-             dist = dist_vec.length()
-             if dist < (self.player1.radius + self.agent_player.radius) and dist > 0:
-                 correction_normal = dist_vec.normalize()
-                 overlap = (self.player1.radius + self.agent_player.radius) - dist
-                 self.player1.pos -= correction_normal * overlap / 2
-                 self.agent_player.pos += correction_normal * overlap / 2
-                 # rects updaten nicht nötig für reine Logik, nur für Pygame draw
-
-
-        # Torerfassung
-        field_top = TRIBUNE_HEIGHT; field_bottom = SCREEN_HEIGHT - TRIBUNE_HEIGHT
-        field_height = field_bottom - field_top;
-        goal_y_start = field_top + (field_height / 2 - GOAL_HEIGHT / 2)
-        goal_y_end = field_top + (field_height / 2 + GOAL_HEIGHT / 2)
+        # 3. Spielphysik aktualisieren (fester Zeitschritt der Simulation)
+        # 4. Kollisionen und Spielregeln (in SoccerSim.step enthalten)
+        events = self.sim.step()
 
+        agent_kicked_ball = False
         goal_for_agent = False
         goal_for_opponent = False
-
-        if self.ball.rect.right < GOAL_WIDTH and goal_y_start < self.ball.pos.y < goal_y_end: # Agent (P2) schießt ins linke Tor
-            self.score_agent += 1
-            goal_for_agent = True
-            terminated = True
-            print(f"RL Agent scored! Current step: {self.current_step}")
-        elif self.ball.rect.left > SCREEN_WIDTH - GOAL_WIDTH and goal_y_start < self.ball.pos.y < goal_y_end: # Gegner (P1) schießt ins rechte Tor
-            self.score_opponent += 1
-            goal_for_opponent = True
-            terminated = True
-            print(f"Opponent scored! Current step: {self.current_step}")
+        for event, index in events:
+            if event == EVENT_KICK and index == 1: # Agent hat gekickt
+                agent_kicked_ball = True
+            elif event == EVENT_GOAL and index == 2: # Agent (P2) schießt ins linke Tor
+                self.score_agent += 1
+                goal_for_agent = True
+                terminated = True
+                print(f"RL Agent scored! Current step: {self.current_step}")
+            elif event == EVENT_GOAL and index == 1: # Gegner (P1) schießt ins rechte Tor
+                self.score_opponent += 1
+                goal_for_opponent = True
+                terminated = True
+                print(f"Opponent scored! Current step: {self.current_step}")
 
         # 5. Reward berechnen (Zielfunktion)
         # Grundbelohnungen
@@ -334,45 +300,42 @@ class SoccerEnv(gym.Env):
         pygame.draw.line(self.screen, (255,255,255), (GOAL_WIDTH, goal_y_start), (GOAL_WIDTH, goal_y_end), 5)
         pygame.draw.line(self.screen, (255,255,255), (SCREEN_WIDTH - GOAL_WIDTH, goal_y_start), (SCREEN_WIDTH - GOAL_WIDTH, goal_y_end), 5)
 
-        # Spieler und Ball (manuell zeichnen, da all_sprites nicht direkt hier ist)
-        # Wichtig: Die `image` und `rect` Attribute der Spieler/Ball müssen aktuell sein
-        # Dies geschieht in deren `update` Methoden, wenn sie mit Pygame Sprites arbeiten.
-        # Wenn nicht, musst du sie hier manuell transformieren/zeichnen.
-        # Für dieses Beispiel nehmen wir an, die Player/Ball Klassen haben eine draw(surface) Methode.
-        # Oder wir erstellen temporäre Sprites für die Darstellung
-        temp_sprites = pygame.sprite.Group(self.player1, self.agent_player, self.ball)
-        
-        # Sicherstellen, dass die Sprites Bilder haben, falls sie im RL-Loop nicht immer welche generieren
-        if not self.player1.image: self.player1.set_avatar(self.player1.color)
-        if not self.agent_player.image: self.agent_player.set_avatar(self.agent_player.color)
-        if not self.ball.image: self.ball.update_appearance()
-
-        # Wichtig: rects müssen aktuell sein für pygame.sprite.Group().draw()
-        self.player1.rect.center = self.player1.pos
-        self.agent_player.rect.center = self.agent_player.pos
-        self.ball.rect.center = self.ball.pos
-
-        # Drehung anwenden, falls die Spieler nicht von sich aus ihr rotiertes Bild aktualisieren
-        # In deinem Code rotiert Player.image im Player.rotate()
-        # Wenn Spieler nicht sprinten, wird rotate() in Player.update() aufgerufen.
-        # Wenn sie sprinten, nicht. Fürs Rendering hier könnte man es erzwingen,
-        # aber besser ist es, wenn die Player-Klasse das self.image immer aktuell hält.
-        # Die Original-Player-Klasse sollte das tun.
-
-        temp_sprites.draw(self.screen)
+        # Spieler und Ball über Sprite-Adapter zeichnen; die Simulation selbst hat keine Bilder.
+        # Die Adapter entstehen erst beim ersten Rendern und neu, wenn reset() eine neue Sim baut.
+        if self.sprites is None or self.sprites.sim is not self.sim:
+            self.sprites = SimSprites(self.sim)
+        self.sprites.sync()
+        self.sprites.draw(self.screen)
 
         if self.render_mode == "human":
             pygame.event.pump() # Wichtig für Pygame Fenster-Events
             pygame.display.flip()
             self.clock.tick(self.metadata['render_fps'])
         elif self.render_mode == "rgb_array":
-            return np.transpose(
-                pygame.surfarray.array3d(self.screen), axes=(1, 0, 2)
-            )
+            return self._rgb_array()
+
+    def _rgb_array(self):
+        """Kopiert die Pixel über eine pixels3d-Sicht in einen einmal angelegten (H, W, 3)-Puffer"""
+        source = self.screen
+        if self.render_size is not None and self.render_size != source.get_size():
+            if self.scaled_screen is None:
+                self.scaled_screen = pygame.Surface(self.render_size)
+            pygame.transform.smoothscale(source, self.render_size, self.scaled_screen)
+            source = self.scaled_screen
+        if self.frame is None:
+            width, height = source.get_size()
+            self.frame = np.empty((height, width, 3), dtype=np.uint8)
+        pixels = pygame.surfarray.pixels3d(source) # (W, H, 3)-Sicht, sperrt die Surface
+        np.copyto(self.frame, pixels.transpose(1, 0, 2))
+        del pixels
+        return self.frame if self.reuse_frame_buffer else self.frame.copy()
 
     def close(self):
         if self.screen is not None:
             pygame.display.quit()
             pygame.quit()
             self.screen = None
-            self.clock = None
\ No newline at end of file
+            self.clock = None
+            self.sprites = None
+            self.scaled_screen = None
+            self.frame = None
\ No newline at end of file
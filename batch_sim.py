@@ -0,0 +1,197 @@
+import numpy as np
+
+from simulation import (
+    SCREEN_WIDTH, PLAYER_RADIUS, BALL_RADIUS,
+    PLAYER_ROTATION_SPEED, PLAYER_SPRINT_SPEED,
+    BALL_FRICTION, BALL_KICK_MULTIPLIER, BALL_PUSH_STRENGTH, BALL_STOP_SPEED,
+    GOAL_WIDTH, FIELD_TOP, FIELD_BOTTOM, FIELD_LEFT, FIELD_RIGHT, FIELD_CENTER_Y,
+    GOAL_Y_START, GOAL_Y_END, FPS,
+    CHECKSUM_SCALE, CHECKSUM_OFFSET, CHECKSUM_PRIME,
+    kickoff_formation,
+)
+
+class BatchSoccerSim:
+    """Struct-of-Arrays Variante von SoccerSim, die N Spiele gleichzeitig rechnet.
+
+    Alle Zustände liegen in NumPy-Arrays mit der Spiel-Achse vorne:
+    player_pos (N, P, 2), player_vel (N, P, 2), player_angle (N, P),
+    player_sprint (N, P), ball_pos (N, 2), ball_vel (N, 2), score (N, 2).
+    Mit team_size > 1 ist P = 2 * team_size (sonst 2) (Reihenfolge wie SoccerSim.players).
+    step() wendet dieselben Regeln wie SoccerSim.step an, nur vektorisiert. Die Spieler-Paare
+    werden dabei über alle Matches gleichzeitig geprüft, daher ohne Broadphase.
+    Mit checksums=True wird pro Match dieselbe rollende Checksumme wie in einer
+    deterministischen SoccerSim geführt (self.checksum, uint64 pro Match).
+    """
+
+    def __init__(self, n, dt=1.0 / FPS, dtype=np.float64, checksums=False, team_size=1):
+        self.n = n
+        self.dt = dt
+        self.dtype = dtype
+        self.checksums = checksums
+        self.team_size = team_size
+        self.num_players = 2 * team_size
+        self.kickoff = kickoff_formation(team_size)
+        self.player_pos = np.zeros((n, self.num_players, 2), dtype=dtype)
+        self.player_vel = np.zeros((n, self.num_players, 2), dtype=dtype)
+        self.player_angle = np.zeros((n, self.num_players), dtype=dtype)
+        self.player_sprint = np.zeros((n, self.num_players), dtype=bool)
+        self.ball_pos = np.zeros((n, 2), dtype=dtype)
+        self.ball_vel = np.zeros((n, 2), dtype=dtype)
+        self.score = np.zeros((n, 2), dtype=np.int32)
+        self.time = 0.0
+        self.frame = 0
+        self.checksum = np.full(n, CHECKSUM_OFFSET, dtype=np.uint64)
+        # Kontakte des letzten Schritts (N, P): Schuss (sprintend) bzw. sanfter Stoß
+        self.last_kick = np.zeros((n, self.num_players), dtype=bool)
+        self.last_touch = np.zeros((n, self.num_players), dtype=bool)
+        self.reset()
+
+    def reset(self):
+        """Neues Spiel in allen Matches: Score, Zeit und Positionen zurücksetzen"""
+        self.score[:] = 0
+        self.time = 0.0
+        self.frame = 0
+        self.checksum[:] = CHECKSUM_OFFSET
+        self.reset_positions()
+
+    def reset_positions(self, mask=None):
+        """Anstoßpositionen setzen - für alle Matches oder nur für mask (N,) bool"""
+        idx = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+        for slot, (x, y, angle) in enumerate(self.kickoff):
+            self.player_pos[idx, slot, 0] = x
+            self.player_pos[idx, slot, 1] = y
+            self.player_angle[idx, slot] = angle
+        self.player_vel[idx] = 0
+        self.player_sprint[idx] = False
+        self.ball_pos[idx, 0] = SCREEN_WIDTH / 2
+        self.ball_pos[idx, 1] = FIELD_CENTER_Y
+        self.ball_vel[idx] = 0
+
+    def step(self, sprint=None, dt=None):
+        """Rückt alle Matches um dt weiter.
+
+        sprint: optionales (N, P) bool-Array mit den Sprint-Entscheidungen.
+        Rückgabe: (N,) int8 mit 0 = kein Tor, 1/2 = Tor für Team 1/2.
+        """
+        if dt is None:
+            dt = self.dt
+        if sprint is not None:
+            self.player_sprint[:] = sprint
+        self._update_players(dt)
+        self._update_ball(dt)
+        self._resolve_ball_collisions()
+        self._resolve_player_collisions()
+        goals = self._check_goal()
+        self.time += dt
+        self.frame += 1
+        if self.checksums:
+            self._mix_checksum()
+        return goals
+
+    def state_words(self):
+        """(N, W) uint64-Zustandswörter, spaltenweise wie SoccerSim.state_words"""
+        values = np.concatenate([
+            self.ball_pos, self.ball_vel,
+            np.concatenate([self.player_pos, self.player_angle[..., None]], axis=2).reshape(self.n, -1),
+        ], axis=1)
+        quantized = np.rint(values * CHECKSUM_SCALE).astype(np.int64).view(np.uint64)
+        return np.concatenate([quantized, self.player_sprint.astype(np.uint64),
+                               self.score.astype(np.uint64)], axis=1)
+
+    def _mix_checksum(self):
+        prime = np.uint64(CHECKSUM_PRIME)
+        checksum = self.checksum
+        for word in self.state_words().T:
+            checksum ^= word
+            checksum *= prime # uint64 läuft wie in SoccerSim modulo 2**64 über
+
+    def _update_players(self, dt):
+        sprint = self.player_sprint
+        # Nicht sprintende Spieler drehen sich, sprintende laufen geradeaus
+        rotated = np.mod(self.player_angle + PLAYER_ROTATION_SPEED * dt, 360)
+        self.player_angle[:] = np.where(sprint, self.player_angle, rotated)
+        rad = np.radians(self.player_angle)
+        self.player_vel[..., 0] = np.where(sprint, np.cos(rad) * PLAYER_SPRINT_SPEED, 0)
+        self.player_vel[..., 1] = np.where(sprint, np.sin(rad) * PLAYER_SPRINT_SPEED, 0)
+        self.player_pos += self.player_vel * dt
+
+        # Kreis-Teil des Spielers im Feld halten
+        np.clip(self.player_pos[..., 0], FIELD_LEFT + PLAYER_RADIUS, FIELD_RIGHT - PLAYER_RADIUS,
+                out=self.player_pos[..., 0])
+        np.clip(self.player_pos[..., 1], FIELD_TOP + PLAYER_RADIUS, FIELD_BOTTOM - PLAYER_RADIUS,
+                out=self.player_pos[..., 1])
+
+    def _update_ball(self, dt):
+        pos = self.ball_pos; vel = self.ball_vel
+        vel *= BALL_FRICTION ** dt
+        stopped = np.hypot(vel[:, 0], vel[:, 1]) < BALL_STOP_SPEED
+        vel[stopped] = 0
+        pos += vel * dt
+
+        x = pos[:, 0]; y = pos[:, 1]
+        in_goal_band = (GOAL_Y_START < y) & (y < GOAL_Y_END)
+        hit_left = (x - BALL_RADIUS < FIELD_LEFT) & ~in_goal_band
+        x[hit_left] = FIELD_LEFT + BALL_RADIUS; vel[hit_left, 0] *= -1
+        hit_right = (x + BALL_RADIUS > FIELD_RIGHT) & ~in_goal_band
+        x[hit_right] = FIELD_RIGHT - BALL_RADIUS; vel[hit_right, 0] *= -1
+        hit_top = y - BALL_RADIUS < FIELD_TOP
+        y[hit_top] = FIELD_TOP + BALL_RADIUS; vel[hit_top, 1] *= -1
+        hit_bottom = y + BALL_RADIUS > FIELD_BOTTOM
+        y[hit_bottom] = FIELD_BOTTOM - BALL_RADIUS; vel[hit_bottom, 1] *= -1
+
+    def _resolve_ball_collisions(self):
+        reach = PLAYER_RADIUS + BALL_RADIUS
+        # Wie in SoccerSim: erst alle Kontakte bestimmen, dann nacheinander auflösen
+        diff = self.ball_pos[:, None, :] - self.player_pos
+        collided = np.einsum('npk,npk->np', diff, diff) < reach ** 2
+        self.last_kick[:] = collided & self.player_sprint
+        self.last_touch[:] = collided & ~self.player_sprint
+        for slot in range(self.num_players):
+            hit = collided[:, slot]
+            if not hit.any():
+                continue
+            ball_pos = self.ball_pos[hit]; ball_vel = self.ball_vel[hit]
+            player_pos = self.player_pos[hit, slot]
+            distance_vec = ball_pos - player_pos
+            distance = np.hypot(distance_vec[:, 0], distance_vec[:, 1])
+            zero = distance == 0
+            normal = distance_vec / np.where(zero, 1, distance)[:, None]
+            normal[zero] = (1, 0)
+
+            kick = self.player_sprint[hit, slot]
+            ball_vel[kick] = normal[kick] * (PLAYER_SPRINT_SPEED * BALL_KICK_MULTIPLIER)
+            ball_vel[~kick] += normal[~kick] * BALL_PUSH_STRENGTH
+
+            overlap = reach - distance
+            resolve = overlap > 0.1
+            correction = normal[resolve] * overlap[resolve, None]
+            ball_pos[resolve] += correction * 0.51
+            player_pos[resolve] -= correction * 0.5
+
+            self.ball_pos[hit] = ball_pos; self.ball_vel[hit] = ball_vel
+            self.player_pos[hit, slot] = player_pos
+
+    def _resolve_player_collisions(self):
+        min_dist = 2 * PLAYER_RADIUS
+        for i in range(self.num_players):
+            for j in range(i + 1, self.num_players):
+                dist_vec = self.player_pos[:, j] - self.player_pos[:, i]
+                dist = np.hypot(dist_vec[:, 0], dist_vec[:, 1])
+                hit = (dist < min_dist) & (dist > 0)
+                if not hit.any():
+                    continue
+                correction = dist_vec[hit] / dist[hit, None] * ((min_dist - dist[hit]) / 2)[:, None]
+                self.player_pos[hit, i] -= correction
+                self.player_pos[hit, j] += correction
+
+    def _check_goal(self):
+        x = self.ball_pos[:, 0]; y = self.ball_pos[:, 1]
+        in_goal_band = (GOAL_Y_START < y) & (y < GOAL_Y_END)
+        goal_for_2 = in_goal_band & (x + BALL_RADIUS < GOAL_WIDTH)
+        goal_for_1 = in_goal_band & ~goal_for_2 & (x - BALL_RADIUS > SCREEN_WIDTH - GOAL_WIDTH)
+        self.score[:, 0] += goal_for_1
+        self.score[:, 1] += goal_for_2
+        goals = np.zeros(self.n, dtype=np.int8)
+        goals[goal_for_1] = 1
+        goals[goal_for_2] = 2
+        return goals
@@ -0,0 +1,56 @@
+"""Benchmark für BatchSoccerSim: Schritte pro Sekunde für verschiedene Match-Anzahlen.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python benchmarks/bench_batch_sim.py [--steps 200] [--sizes 1 64 1024 16384]
+
+Dass BatchSoccerSim dieselben Zustände und Checksummen wie SoccerSim liefert, prüft
+tests/test_batch_sim.py (python -m pytest -q).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import SoccerSim, EVENT_GOAL
+from batch_sim import BatchSoccerSim
+
+def bench_batch(n, num_steps):
+    sim = BatchSoccerSim(n)
+    rng = np.random.default_rng(0)
+    sprint = rng.random((num_steps, n, 2)) < 0.5
+    sim.step(sprint[0]) # Aufwärmen
+    start = time.perf_counter()
+    for step in range(num_steps):
+        goals = sim.step(sprint[step])
+        if goals.any():
+            sim.reset_positions(goals > 0)
+    return num_steps / (time.perf_counter() - start)
+
+def bench_scalar(num_steps):
+    sim = SoccerSim()
+    start = time.perf_counter()
+    for step in range(num_steps):
+        sim.player1.is_sprinting = step % 90 < 45
+        sim.player2.is_sprinting = step % 70 < 30
+        if any(event == EVENT_GOAL for event, _ in sim.step()): # Wie der Batch: nur nach einem Tor neu aufstellen
+            sim.reset_positions()
+    return num_steps / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 64, 1024, 16384])
+    args = parser.parse_args()
+
+    scalar_sps = bench_scalar(args.steps * 5)
+    print(f"{'SoccerSim (skalar)':>24}: {scalar_sps:12.0f} Schritte/s {scalar_sps:14.0f} Match-Schritte/s")
+    for n in args.sizes:
+        sps = bench_batch(n, args.steps)
+        print(f"{f'BatchSoccerSim N={n}':>24}: {sps:12.0f} Schritte/s {sps * n:14.0f} Match-Schritte/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark für die Kollisionen in SoccerSim: alle Paare gegen Spatial Hash je Teamgröße.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python benchmarks/bench_collisions.py [--steps 600] [--team-sizes 1 3 5 11 25 50]
+
+Gemessen wird die Zeit in den Kollisionsphasen (Ball-Spieler und Spieler-Spieler)
+pro Schritt sowie die Zeit des ganzen Schritts. Beide Varianten laufen mit denselben
+zufälligen Sprint-Eingaben. Die letzte Spalte zeigt, ob die Checksummen gleich sind:
+in sehr dichten Gedrängen kann eine Korrektur ein neues Paar überlappen lassen, das
+alle Paare noch im selben Schritt auflösen, das Gitter erst im nächsten.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import simulation
+from simulation import SoccerSim, EVENT_GOAL
+
+class TimedSim(SoccerSim):
+    """SoccerSim, die die Zeit in den Kollisionsphasen mitschreibt"""
+    collision_time = 0.0
+
+    def _resolve_ball_collisions(self, events):
+        start = time.perf_counter()
+        super()._resolve_ball_collisions(events)
+        self.collision_time += time.perf_counter() - start
+
+    def _resolve_player_collisions(self):
+        start = time.perf_counter()
+        super()._resolve_player_collisions()
+        self.collision_time += time.perf_counter() - start
+
+def bench(team_size, num_steps, broadphase, seed=0):
+    """Gibt (µs Kollisionen pro Schritt, µs pro Schritt, Checksumme) zurück"""
+    simulation.BROADPHASE_MIN_PLAYERS = 0 if broadphase else float("inf")
+    sim = TimedSim(seed=seed, team_size=team_size)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        for player in sim.players: # Sprint nur gelegentlich umschalten, damit sich Spieler treffen
+            if rng.random() < 0.03:
+                player.is_sprinting = not player.is_sprinting
+        if any(event == EVENT_GOAL for event, _ in sim.step()):
+            sim.reset_positions()
+    total = time.perf_counter() - start
+    return sim.collision_time / num_steps * 1e6, total / num_steps * 1e6, sim.checksum
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--team-sizes", type=int, nargs="+", default=[1, 3, 5, 11, 25, 50])
+    args = parser.parse_args()
+
+    default_threshold = simulation.BROADPHASE_MIN_PLAYERS
+    print(f"{'Spieler':>8} {'alle Paare':>22} {'Spatial Hash':>22} {'gleich':>7}   (µs Kollision / µs Schritt)")
+    try:
+        for team_size in args.team_sizes:
+            pairs_collision, pairs_step, pairs_checksum = bench(team_size, args.steps, broadphase=False)
+            grid_collision, grid_step, grid_checksum = bench(team_size, args.steps, broadphase=True)
+            same = "ja" if pairs_checksum == grid_checksum else "nein"
+            print(f"{2 * team_size:>8} {pairs_collision:10.1f} / {pairs_step:9.1f} {grid_collision:10.1f} / {grid_step:9.1f} {same:>7}")
+    finally:
+        simulation.BROADPHASE_MIN_PLAYERS = default_threshold
+
+if __name__ == "__main__":
+    main()
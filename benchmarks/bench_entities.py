@@ -0,0 +1,62 @@
+"""Benchmark für Entity-Zustände: Speicher und Aufbauzeit mit und ohne Sprite-Adapter.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python benchmarks/bench_entities.py [--count 2000] [--resets 500]
+
+"Zustand" sind die __slots__-Records aus simulation.py, "mit Sprite" zusätzlich die
+Adapter aus sprites.py (Avatar-Surface, rect) - so wie jede Entity vor der Trennung
+aussah. Außerdem wird die Zeit für SoccerSim() und SoccerSim.reset_positions() gemessen.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from simulation import SoccerSim, Player, Ball, DEFAULT_P1_COLOR
+from sprites import PlayerSprite, BallSprite
+
+def measure(build, count):
+    """(Bytes pro Entity, µs pro Entity) für count Aufrufe von build(i)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    entities = [build(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entities
+    return (after - before) / count, elapsed / count * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--resets", type=int, default=500)
+    args = parser.parse_args()
+
+    cases = [
+        ("Player (Zustand)", lambda i: Player(i % 800, 300, DEFAULT_P1_COLOR, None, i % 360)),
+        ("Player (mit Sprite)", lambda i: PlayerSprite(Player(i % 800, 300, DEFAULT_P1_COLOR, None, i % 360))),
+        ("Ball (Zustand)", lambda i: Ball(i % 800, 300)),
+        ("Ball (mit Sprite)", lambda i: BallSprite(Ball(i % 800, 300))),
+    ]
+    # Surface-Pixel liegen außerhalb des Python-Heaps; tracemalloc sieht nur die Objekte selbst
+    for name, build in cases:
+        size, micros = measure(build, args.count)
+        print(f"{name:>22}: {size:10.0f} Bytes/Entity {micros:10.1f} µs/Entity")
+
+    start = time.perf_counter()
+    sims = [SoccerSim() for _ in range(args.resets)]
+    print(f"{'SoccerSim()':>22}: {(time.perf_counter() - start) / args.resets * 1e6:10.1f} µs")
+    sim = sims[0]
+    start = time.perf_counter()
+    for _ in range(args.resets):
+        sim.reset_positions()
+    print(f"{'reset_positions()':>22}: {(time.perf_counter() - start) / args.resets * 1e6:10.1f} µs")
+
+if __name__ == "__main__":
+    main()
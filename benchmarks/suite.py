@@ -0,0 +1,298 @@
+"""Benchmark-Suite: Physik, Env-Schritte, Bot-Latenz, Partikel und Frame-Zeiten von game.py.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python benchmarks/suite.py [--output bench.json] [--baseline benchmarks/baseline.json]
+        [--threshold 0.10] [--save-baseline | --no-compare] [--only physics env] [--repeat 5] [--quick]
+
+Jede Messung liefert einen Wert mit Einheit und Richtung (höher/niedriger ist besser);
+wiederholte Messungen werden über den Median zusammengefasst. Das Ergebnis wird als
+JSON geschrieben (--output, sonst stdout). Mit --baseline werden alle Werte mit einer
+gespeicherten Baseline verglichen; eine Verschlechterung über --threshold (relativ)
+gilt als Regression und beendet das Skript mit Exit-Code 1. --save-baseline schreibt
+die aktuelle Messung als neue Baseline. Solange unter benchmarks/baseline.json keine
+Baseline liegt (sie hängt von der Maschine ab und wird nicht mitgeliefert), wird ohne
+--baseline nur gemessen; eine ausdrücklich angegebene, fehlende Baseline bricht vor dem
+Messen mit Exit-Code 2 ab (--no-compare: nie vergleichen).
+
+Die Frame-Zeiten laufen durch die echte Hauptschleife von game.py (Dummy-Videotreiber,
+Uhr ohne Warten): gemessen wird von clock.tick bis zum Ende des Präsentierens
+(display.flip bzw. display.update, einmal pro Frame), getrennt nach Menü, laufendem
+Spiel und Torjubel.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "ai"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import visuals
+from simulation import (
+    SoccerSim, EVENT_GOAL,
+    SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_RADIUS, BALL_RADIUS, GOAL_WIDTH, TRIBUNE_HEIGHT, FIELD_CENTER_Y, FPS,
+)
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.10
+
+def metric(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def median_of(repeat, measure):
+    return statistics.median(measure() for _ in range(repeat))
+
+# --- Messungen ---
+def bench_physics(repeat, scale):
+    """Physik-Schritte pro Sekunde (ohne Effekte), 1v1 und 11v11"""
+    results = {}
+    for team_size, steps in ((1, 20000), (11, 2000)):
+        steps = max(1, int(steps * scale))
+        def measure():
+            sim = SoccerSim(seed=0, team_size=team_size)
+            rng = random.Random(0)
+            sprints = [[rng.random() < 0.5 for _ in sim.players] for _ in range(64)]
+            start = time.perf_counter()
+            for step in range(steps):
+                if step % 16 == 0: # Sprint-Zustände gelegentlich wechseln, damit es zu Kontakten kommt
+                    for player, sprint in zip(sim.players, sprints[(step // 16) % 64]):
+                        if sprint: player.start_sprint()
+                        else: player.stop_sprint()
+                if any(event == EVENT_GOAL for event, _ in sim.step()):
+                    sim.reset_positions()
+            return steps / (time.perf_counter() - start)
+        results[f"physics.steps_per_sec.{team_size}v{team_size}"] = metric(median_of(repeat, measure), "steps/s", True)
+    return results
+
+def bench_env(repeat, scale):
+    """SoccerEnv.step pro Sekunde ohne Rendering, mit rgb_array (step + render) und mit Gitter-Beobachtung"""
+    from rl_env import SoccerEnv
+    results = {}
+    for name, render_mode, observation_mode, steps in (("none", None, "vector", 5000), ("rgb_array", "rgb_array", "vector", 500),
+                                                       ("grid", None, "grid", 2000)):
+        steps = max(1, int(steps * scale))
+        def measure():
+            env = SoccerEnv(render_mode=render_mode, observation_mode=observation_mode)
+            env.reset(seed=0)
+            env.action_space.seed(0)
+            actions = [env.action_space.sample() for _ in range(steps)]
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for action in actions:
+                    _, _, terminated, truncated, _ = env.step(action)
+                    if render_mode is not None:
+                        env.render()
+                    if terminated or truncated:
+                        env.reset(seed=0)
+                elapsed = time.perf_counter() - start
+            env.close()
+            return steps / elapsed
+        results[f"env.steps_per_sec.{name}"] = metric(median_of(repeat, measure), "steps/s", True)
+    return results
+
+def bench_bots(repeat, scale):
+    """Latenz von bot_left.get_bot_decision über die Zustände eines laufenden Spiels"""
+    import bot_left
+    calls = max(1, int(5000 * scale))
+    def measure():
+        sim = SoccerSim(seed=0)
+        timings = np.zeros(calls, dtype=np.int64)
+        with contextlib.redirect_stdout(io.StringIO()): # Der Bot meldet Moduswechsel per print
+            bot_left.reset_bot_state()
+            for call in range(calls):
+                start = time.perf_counter_ns()
+                sprint = bot_left.get_bot_decision(sim.player1, sim.ball, SCREEN_WIDTH - GOAL_WIDTH, SCREEN_WIDTH,
+                                                   SCREEN_HEIGHT, PLAYER_RADIUS, BALL_RADIUS, TRIBUNE_HEIGHT, sim.dt)
+                timings[call] = time.perf_counter_ns() - start
+                if sprint and not sim.player1.is_sprinting: sim.player1.start_sprint()
+                elif not sprint and sim.player1.is_sprinting: sim.player1.stop_sprint()
+                if any(event == EVENT_GOAL for event, _ in sim.step()):
+                    sim.reset_positions()
+        return timings.mean() / 1e3, np.percentile(timings, 99) / 1e3
+    runs = [measure() for _ in range(repeat)]
+    return {"bot.decision_us.mean": metric(statistics.median(run[0] for run in runs), "µs", False),
+            "bot.decision_us.p99": metric(statistics.median(run[1] for run in runs), "µs", False)}
+
+def bench_particles(repeat, scale):
+    """update_and_draw_particles bei voller Partikel-Liste (MAX_PARTICLES)"""
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    frames = max(1, int(300 * scale))
+    def measure():
+        rng = random.Random(0)
+        visuals.clear_particles()
+        elapsed = 0.0
+        for _ in range(frames):
+            while len(visuals.particles) < visuals.MAX_PARTICLES: # Auffüllen zählt nicht mit
+                visuals.emit_particles(1, (rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)),
+                                       (200, 120, 40), life_range=(0.5, 2.0), radius_range=(1, 8), rng=rng)
+            start = time.perf_counter()
+            visuals.update_and_draw_particles(1.0 / FPS, surface)
+            elapsed += time.perf_counter() - start
+        visuals.clear_particles()
+        return elapsed / frames * 1e3
+    return {"particles.frame_ms": metric(median_of(repeat, measure), "ms", False)}
+
+class _FrameClock:
+    """Ersatz für pygame.time.Clock: kein Warten, fester Zeitschritt, merkt sich den Frame-Beginn"""
+    started = 0
+
+    def __init__(self):
+        pass
+
+    def tick(self, framerate=0):
+        _FrameClock.started = time.perf_counter_ns()
+        return 1000 // FPS
+
+    def get_rawtime(self):
+        return 0 # Qualitätsregler bleibt auf voller Qualität: gemessen wird immer dieselbe Arbeit
+
+def run_game_frames(menu_frames, play_frames, goal_frames):
+    """Spielt game.py im Modus Bot gegen Bot und liefert {Zustand: [Frame-Zeiten in ns]}"""
+    timings = {}
+    state = {"frame": 0, "goal_at": None}
+    path = os.path.join(ROOT_DIR, "game.py")
+    game = {"__name__": "__main__", "__file__": path} # Globale Variablen der Hauptschleife (wie runpy, aber live lesbar)
+    original_clock = pygame.time.Clock; original_get = pygame.event.get
+    original_flip = pygame.display.flip; original_update = pygame.display.update
+
+    def presented(present):
+        def wrapper(*args, **kwargs):
+            result = present(*args, **kwargs)
+            timings.setdefault(game["game_state"], []).append(time.perf_counter_ns() - _FrameClock.started)
+            return result
+        return wrapper
+
+    def get(*args, **kwargs):
+        events = list(original_get(*args, **kwargs))
+        frame = state["frame"]; state["frame"] += 1
+        if frame == menu_frames:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_3, mod=0, unicode="3", scancode=0))
+        elif frame > menu_frames + play_frames and state["goal_at"] is None \
+                and game["game_state"] == game["STATE_PLAYING"]:
+            state["goal_at"] = frame # Ball ins linke Tor schießen, damit der Torjubel beginnt
+            game["ball"].pos.update(GOAL_WIDTH + BALL_RADIUS + 2, FIELD_CENTER_Y)
+            game["ball"].velocity.update(-600, 0)
+        done = len(timings.get("GOAL_PAUSE", ())) >= goal_frames and len(timings.get("PLAYING", ())) >= play_frames
+        if done or frame > 10 * (menu_frames + play_frames + goal_frames):
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    pygame.time.Clock = _FrameClock; pygame.event.get = get
+    pygame.display.flip = presented(original_flip); pygame.display.update = presented(original_update)
+    try:
+        with open(path, encoding="utf-8") as f:
+            code = compile(f.read(), path, "exec")
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):
+            exec(code, game)
+    finally:
+        pygame.time.Clock = original_clock; pygame.event.get = original_get
+        pygame.display.flip = original_flip; pygame.display.update = original_update
+        visuals.clear_particles()
+    return timings
+
+def bench_frames(repeat, scale):
+    """Frame-Zeit der Hauptschleife von game.py in Menü, Spiel und Torjubel"""
+    counts = max(5, int(180 * scale)), max(5, int(300 * scale)), max(5, int(80 * scale))
+    runs = [run_game_frames(*counts) for _ in range(repeat)]
+    results = {}
+    for state, name in (("MENU", "menu"), ("PLAYING", "play"), ("GOAL_PAUSE", "goal")):
+        medians = [np.median(run[state]) / 1e6 for run in runs if run.get(state)]
+        if medians:
+            results[f"frame.{name}_ms"] = metric(statistics.median(medians), "ms", False)
+    return results
+
+BENCHMARKS = {
+    "physics": bench_physics,
+    "env": bench_env,
+    "bots": bench_bots,
+    "particles": bench_particles,
+    "frames": bench_frames,
+}
+
+# --- Vergleich ---
+def compare(results, baseline, threshold):
+    """Liste von (Name, Baseline, aktuell, relative Änderung, Regression?) für gemeinsame Messwerte"""
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        worse = -change if current["higher_is_better"] else change # > 0: schlechter
+        rows.append((name, base["value"], current["value"], change, worse > threshold))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Nur diese Gruppen messen")
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Messung (Median)")
+    parser.add_argument("--quick", action="store_true", help="Kurze Läufe (ein Zehntel), z.B. als Smoke-Test")
+    parser.add_argument("--output", help="JSON-Datei für die Ergebnisse (sonst stdout)")
+    parser.add_argument("--baseline", help=f"Baseline-Datei (Standard: {os.path.relpath(DEFAULT_BASELINE, ROOT_DIR)}, falls vorhanden)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative Verschlechterung, ab der gemeldet wird")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    mode.add_argument("--no-compare", action="store_true", help="Nur messen, nicht mit der Baseline vergleichen")
+    args = parser.parse_args()
+    compare_baseline = not args.save_baseline and not args.no_compare
+    if args.baseline is None:
+        args.baseline = DEFAULT_BASELINE
+        if compare_baseline and not os.path.exists(args.baseline):
+            print(f"Keine Baseline unter {args.baseline} - nur Messung (anlegen mit --save-baseline)", file=sys.stderr)
+            compare_baseline = False
+    elif compare_baseline and not os.path.exists(args.baseline): # Vor dem Messen melden, nicht erst danach
+        parser.error(f"keine Baseline unter {args.baseline} - mit --save-baseline anlegen oder --no-compare angeben")
+
+    pygame.init()
+    scale = 0.1 if args.quick else 1.0
+    results = {}
+    for group in args.only or BENCHMARKS:
+        start = time.perf_counter()
+        results.update(BENCHMARKS[group](args.repeat, scale))
+        print(f"{group:>10}: {time.perf_counter() - start:6.1f}s", file=sys.stderr)
+        pygame.init() # game.py beendet pygame am Ende der Schleife
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"),
+              "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                          "pygame": pygame.version.ver, "numpy": np.__version__},
+              "repeat": args.repeat, "quick": args.quick, "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    regressions = 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Baseline gespeichert: {args.baseline}", file=sys.stderr)
+    elif compare_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nVergleich mit {args.baseline} (Schwelle {args.threshold:.0%})", file=sys.stderr)
+        if baseline.get("quick") != args.quick:
+            print("Achtung: Baseline und Messung unterscheiden sich in --quick, die Werte sind kaum vergleichbar",
+                  file=sys.stderr)
+        for name, base, current, change, regression in compare(results, baseline["results"], args.threshold):
+            regressions += regression
+            flag = "REGRESSION" if regression else ""
+            print(f"{name:>32}: {base:12.3f} -> {current:12.3f} {change:+8.1%} {flag}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
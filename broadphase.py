@@ -0,0 +1,54 @@
+# Broadphase für Kreis-Kollisionen: gleichmäßiges Gitter (Spatial Hash)
+#
+# Die Zellgröße muss mindestens so groß sein wie der größte Kontaktabstand
+# (bei Spielern 2 * PLAYER_RADIUS). Dann liegen zwei sich berührende Kreise immer
+# in derselben oder in benachbarten Zellen, und nur diese Paare werden geprüft.
+
+# Halbe Nachbarschaft: jedes Zellpaar wird genau einmal besucht
+_NEIGHBOUR_OFFSETS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def rebuild(self, positions):
+        """Baut das Gitter aus einer Liste von Positionen (Vector2) neu auf"""
+        cells = self.cells; size = self.cell_size
+        cells.clear()
+        for index, pos in enumerate(positions):
+            key = (int(pos.x // size), int(pos.y // size))
+            bucket = cells.get(key)
+            if bucket is None: cells[key] = [index]
+            else: bucket.append(index)
+
+    def query(self, pos, radius):
+        """Sortierte Indizes aller Einträge in Zellen, die den Kreis (pos, radius) berühren"""
+        cells = self.cells; size = self.cell_size
+        found = []
+        for cx in range(int((pos.x - radius) // size), int((pos.x + radius) // size) + 1):
+            for cy in range(int((pos.y - radius) // size), int((pos.y + radius) // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket: found.extend(bucket)
+        found.sort()
+        return found
+
+    def pairs(self):
+        """Kandidatenpaare (i, j) mit i < j aus derselben oder benachbarten Zellen, sortiert"""
+        cells = self.cells
+        result = []
+        for (cx, cy), bucket in cells.items():
+            count = len(bucket)
+            for a in range(count):
+                for b in range(a + 1, count):
+                    i, j = bucket[a], bucket[b]
+                    result.append((i, j) if i < j else (j, i))
+            for dx, dy in _NEIGHBOUR_OFFSETS:
+                other = cells.get((cx + dx, cy + dy))
+                if not other:
+                    continue
+                for i in bucket:
+                    for j in other:
+                        result.append((i, j) if i < j else (j, i))
+        result.sort()
+        return result
@@ -0,0 +1,54 @@
+# Dirty-Rect-Rendering: nur geänderte Bereiche neu zeichnen und an das Display schicken.
+#
+# Ablauf pro Frame:
+#     renderer.begin(background)   Bereiche des letzten Frames aus dem Hintergrund restaurieren
+#     renderer.add(screen.blit(...)) bzw. add(Liste/None) für alles, was gezeichnet wird
+#     renderer.present()           display.update(alte + neue Bereiche)
+# Wechselt der Hintergrund (z.B. Menü -> Spielfeld) oder ist der Modus aus, wird wie
+# bisher der ganze Hintergrund geblittet und display.flip() aufgerufen.
+import pygame
+
+class DirtyRectRenderer:
+    def __init__(self, screen, enabled=False):
+        self.screen = screen
+        self.enabled = enabled
+        self.bounds = screen.get_rect()
+        self.background = None
+        self.previous = [] # Bereiche des letzten Frames: werden restauriert und mit aktualisiert
+        self.current = []
+        self.full = True
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.full = True
+
+    def begin(self, background):
+        """Frame beginnen: Hintergrund ganz oder nur an den alten Stellen neu zeichnen"""
+        screen = self.screen
+        if not self.enabled or self.full or background is not self.background:
+            screen.blit(background, (0, 0))
+            self.full = True
+        else:
+            for rect in self.previous:
+                screen.blit(background, rect, rect)
+        self.background = background
+        self.current = []
+
+    def add(self, area):
+        """Gezeichneten Bereich merken: Rect, Liste von Rects oder None"""
+        if area is None or not self.enabled:
+            return
+        if isinstance(area, pygame.Rect):
+            area = (area,)
+        for rect in area:
+            rect = rect.clip(self.bounds)
+            if rect.width and rect.height:
+                self.current.append(rect)
+
+    def present(self):
+        if not self.enabled or self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.full = False
@@ -0,0 +1,137 @@
+# Beobachtungen als kleines Belegungsgitter für Pixel-Policies, direkt mit NumPy gerastert.
+#
+# Statt die 800x600-Szene mit pygame zu zeichnen und herunterzuskalieren, wird das Spielfeld
+# (FIELD_TOP..FIELD_BOTTOM, volle Breite) auf ein Gitter von width x height Zellen abgebildet.
+# Jede Zelle ist 255, wenn ihr Mittelpunkt in einer Scheibe liegt, sonst 0 (uint8, wie ein Bild).
+# Kanäle: CHANNELS. Gerastert wird immer ein ganzer Batch in einem Aufruf:
+#     ball_pos (N, 2), player_pos (N, P, 2), player_angle (N, P) -> (N, C, H, W)
+# also direkt die Arrays von BatchSoccerSim; eine einzelne SoccerSim ist ein Batch mit N = 1.
+#
+# FrameStack hält die letzten depth Frames so, dass der Stapel immer eine zusammenhängende
+# Sicht ist: Jeder Frame wird in zwei Slots des Rings geschrieben (i und i + depth), die
+# Sicht ist buffer[:, i + 1:i + 1 + depth] - neue Frames verschieben nichts.
+import numpy as np
+
+from simulation import (
+    SCREEN_WIDTH, PLAYER_RADIUS, BALL_RADIUS, FIELD_TOP, FIELD_BOTTOM,
+    GOAL_WIDTH, GOAL_Y_START, GOAL_Y_END,
+)
+
+CHANNELS = ("field", "goals", "ball", "team1", "team2", "heading")
+STATIC_CHANNELS = 2 # field und goals hängen nicht vom Zustand ab
+OCCUPIED = 255
+HEADING_RADIUS = PLAYER_RADIUS * 0.4 # Punkt vorne am Spieler zeigt die Blickrichtung
+
+class GridRasterizer:
+    def __init__(self, width=84, height=84, team_size=1):
+        self.width = width
+        self.height = height
+        self.team_size = team_size
+        self.shape = (len(CHANNELS), height, width)
+        cell_w = SCREEN_WIDTH / width
+        cell_h = (FIELD_BOTTOM - FIELD_TOP) / height
+        self.xs = (np.arange(width) + 0.5) * cell_w # Zellmittelpunkte in Bildschirmkoordinaten
+        self.ys = FIELD_TOP + (np.arange(height) + 0.5) * cell_h
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        # Kleine Objekte belegen mindestens die nächste Zelle
+        min_radius = 0.5 * np.hypot(cell_w, cell_h)
+        self.radii = np.maximum((BALL_RADIUS, PLAYER_RADIUS, HEADING_RADIUS), min_radius)
+        # Jede Scheibe wird nur in einem Fenster fester Größe um ihren Mittelpunkt geprüft
+        largest = self.radii.max()
+        self.window_rows = np.arange(int(np.ceil(2 * largest / cell_h)) + 2)
+        self.window_cols = np.arange(int(np.ceil(2 * largest / cell_w)) + 2)
+        self.static = self._render_static(cell_w, cell_h)
+        self.entities = {}
+
+    def _render_static(self, cell_w, cell_h):
+        """Spielfeldrand und Mittellinie bzw. Torräume"""
+        static = np.zeros((STATIC_CHANNELS, self.height, self.width), dtype=np.uint8)
+        field = static[0]
+        field[[0, -1], :] = OCCUPIED
+        field[:, [0, -1]] = OCCUPIED
+        field[:, np.abs(self.xs - SCREEN_WIDTH / 2) < cell_w / 2 + 1] = OCCUPIED
+        in_mouth = (self.ys >= GOAL_Y_START) & (self.ys <= GOAL_Y_END)
+        in_goal = (self.xs < GOAL_WIDTH + cell_w) | (self.xs > SCREEN_WIDTH - GOAL_WIDTH - cell_w)
+        static[1][np.ix_(in_mouth, in_goal)] = OCCUPIED
+        return static
+
+    def _stamp(self, out, centers, radii, channels):
+        """Scheiben (N, M, 2) mit Radien (M,) in die Kanäle (M,) von out setzen"""
+        rows = np.floor((centers[..., 1, None] - radii[:, None] - FIELD_TOP) / self.cell_h).astype(np.intp) + self.window_rows
+        cols = np.floor((centers[..., 0, None] - radii[:, None]) / self.cell_w).astype(np.intp) + self.window_cols
+        rows_inside = (rows >= 0) & (rows < self.height)
+        cols_inside = (cols >= 0) & (cols < self.width)
+        rows = np.where(rows_inside, rows, 0); cols = np.where(cols_inside, cols, 0)
+        dy2 = np.where(rows_inside, (self.ys[rows] - centers[..., 1, None]) ** 2, np.inf) # (N, M, kh)
+        dx2 = np.where(cols_inside, (self.xs[cols] - centers[..., 0, None]) ** 2, np.inf) # (N, M, kw)
+        hit = dy2[..., :, None] + dx2[..., None, :] <= (radii ** 2)[:, None, None]
+        match, entity, row, col = np.nonzero(hit)
+        out[match, channels[entity], rows[match, entity, row], cols[match, entity, col]] = OCCUPIED
+
+    def render(self, ball_pos, player_pos, player_angle, out=None, team_size=None):
+        """Batch rastern: (N, 2), (N, P, 2), (N, P) -> (N, C, H, W) uint8, optional in out
+
+        team_size: Spieler pro Team (erst Team 1, dann Team 2), Standard self.team_size.
+        """
+        ball_pos = np.asarray(ball_pos, dtype=np.float64)
+        player_pos = np.asarray(player_pos, dtype=np.float64)
+        n, num_players = player_pos.shape[:2]
+        if out is None:
+            out = np.empty((n,) + self.shape, dtype=np.uint8)
+        out[:, :STATIC_CHANNELS] = self.static
+        out[:, STATIC_CHANNELS:] = 0
+        rad = np.radians(player_angle)
+        noses = player_pos + PLAYER_RADIUS * np.stack((np.cos(rad), np.sin(rad)), axis=-1)
+        centers = np.concatenate((ball_pos[:, None], player_pos, noses), axis=1) # (N, 1 + 2P, 2)
+        self._stamp(out, centers, *self._entities(num_players, team_size or self.team_size))
+        return out
+
+    def _entities(self, num_players, team_size):
+        """Radien und Kanäle in der Reihenfolge Ball, Spieler, Blickrichtungen"""
+        entities = self.entities.get((num_players, team_size))
+        if entities is None:
+            ball_r, player_r, heading_r = self.radii
+            team_channels = [3 if slot < team_size else 4 for slot in range(num_players)]
+            entities = (np.array([ball_r] + [player_r] * num_players + [heading_r] * num_players),
+                        np.array([2] + team_channels + [5] * num_players))
+            self.entities[(num_players, team_size)] = entities
+        return entities
+
+    def render_batch(self, batch, out=None):
+        """Alle Matches einer BatchSoccerSim"""
+        return self.render(batch.ball_pos, batch.player_pos, batch.player_angle, out, batch.team_size)
+
+    def render_sim(self, sim, out=None):
+        """Eine SoccerSim als Batch mit N = 1"""
+        ball = sim.ball
+        players = sim.players
+        return self.render(((ball.pos.x, ball.pos.y),),
+                           ([(player.pos.x, player.pos.y) for player in players],),
+                           ([player.angle for player in players],), out, sim.team_size)
+
+class FrameStack:
+    def __init__(self, n, frame_shape, depth, dtype=np.uint8):
+        self.depth = depth
+        self.buffer = np.zeros((n, 2 * depth) + tuple(frame_shape), dtype=dtype)
+        self.position = 0 # Slot des neuesten Frames (< depth); sein Spiegel liegt bei position + depth
+        self.observation_shape = (n, depth * frame_shape[0]) + tuple(frame_shape[1:])
+
+    def push(self, render):
+        """render(out) zeichnet den neuen Frame (N, C, H, W) in den Ring; liefert den Stapel"""
+        position = (self.position + 1) % self.depth
+        newest = self.buffer[:, position + self.depth]
+        render(newest)
+        self.buffer[:, position] = newest
+        self.position = position
+        return self.stacked()
+
+    def stacked(self):
+        """Sicht (N, depth * C, H, W), älteste Frames zuerst - wird vom nächsten push überschrieben"""
+        window = self.buffer[:, self.position + 1:self.position + 1 + self.depth]
+        return window.reshape(self.observation_shape)
+
+    def fill(self, mask=None):
+        """Nach einem Reset: alle Slots (oder nur die von mask) mit dem neuesten Frame füllen"""
+        index = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+        self.buffer[index] = self.buffer[index, self.position + self.depth][:, None]
@@ -0,0 +1,122 @@
+# Frame-Profiler: misst die Phasen der Hauptschleife und zeichnet p50/p95/p99 als Balken.
+#
+# Die Schleife ruft start_frame() nach clock.tick, danach nach jeder Phase lap(name);
+# lap ordnet die Zeit seit dem letzten lap der Phase zu (exklusiv, mehrfach pro Frame
+# möglich, z.B. pro Physik-Schritt). end_frame() schreibt die Summen in einen Ringpuffer
+# der letzten WINDOW Frames. Ausgeschaltet kehrt jeder Aufruf sofort zurück, und die
+# Kollisionsfunktionen der Simulation sind nicht umwickelt.
+import time
+
+import numpy as np
+import pygame
+
+WINDOW = 240               # Frames für die Perzentile
+REFRESH_FRAMES = 15        # Perzentile nur alle n Frames neu berechnen
+PERCENTILES = (50, 95, 99)
+BAR_WIDTH = 160
+ROW_HEIGHT = 16
+BACKGROUND_COLOR = (0, 0, 0, 170)
+BAR_COLORS = ((80, 200, 80), (230, 200, 60), (230, 80, 60)) # p50, p95, p99
+BUDGET_COLOR = (255, 255, 255)
+
+# Methoden von SoccerSim, die als Phase "collisions" gemessen werden
+COLLISION_METHODS = ("_resolve_ball_collisions", "_resolve_player_collisions", "_check_goal", "_sweep_ball")
+
+class FrameProfiler:
+    def __init__(self, phases, frame_budget, enabled=False, font=None):
+        self.phases = tuple(phases)
+        self.index = {phase: i for i, phase in enumerate(self.phases)}
+        self.frame_budget_ns = frame_budget * 1e9
+        self.samples = np.zeros((WINDOW, len(self.phases)), dtype=np.int64)
+        self.current = [0] * len(self.phases)
+        self.frames = 0
+        self.last = 0
+        self.stats = np.zeros((len(PERCENTILES), len(self.phases)))
+        self.font = font
+        self.panel = None # Fertig gezeichnetes Overlay, neu nur wenn sich die Perzentile ändern
+        self.sim = None
+        self.enabled = False
+        if enabled:
+            self.toggle()
+
+    def attach(self, sim):
+        """Kollisionen der Simulation als eigene Phase messen (nur solange eingeschaltet)"""
+        self.sim = sim
+        if self.enabled:
+            self._instrument(True)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.samples[:] = 0; self.frames = 0
+        self.stats[:] = 0; self.panel = None
+        self.start_frame() # Beim Einschalten mitten im Frame ab hier messen
+        if self.sim is not None:
+            self._instrument(self.enabled)
+
+    def _instrument(self, on):
+        sim = self.sim
+        for name in COLLISION_METHODS:
+            if on:
+                setattr(sim, name, self._timed(getattr(type(sim), name).__get__(sim)))
+            else:
+                sim.__dict__.pop(name, None) # Wieder die Methode der Klasse
+
+    def _timed(self, method):
+        def timed(*args, **kwargs):
+            self.lap("physics") # Bisherige Zeit des Schritts gehört zur Physik
+            result = method(*args, **kwargs)
+            self.lap("collisions")
+            return result
+        return timed
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.current = [0] * len(self.phases)
+        self.last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        """Zeit seit dem letzten lap (bzw. start_frame) der Phase zuschreiben"""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.current[self.index[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.samples[self.frames % WINDOW] = self.current
+        self.frames += 1
+        if self.frames % REFRESH_FRAMES == 0:
+            self.stats = np.percentile(self.samples[:min(self.frames, WINDOW)], PERCENTILES, axis=0)
+            self.panel = None
+
+    def draw(self, surface, x=10, y=60):
+        """Balken je Phase: p50 (grün), p95 (gelb), p99 (rot); weiße Linie = Frame-Budget"""
+        if not self.enabled:
+            return
+        if self.panel is None:
+            self.panel = self._render_panel()
+        return surface.blit(self.panel, (x, y))
+
+    def _render_panel(self):
+        font = self.font or pygame.font.Font(None, 18)
+        self.font = font
+        label_width = 80
+        height = ROW_HEIGHT * (len(self.phases) + 1) + 6
+        panel = pygame.Surface((label_width + BAR_WIDTH + 150, height), pygame.SRCALPHA)
+        panel.fill(BACKGROUND_COLOR)
+        scale = BAR_WIDTH / self.frame_budget_ns
+        header = font.render("Phase         ms: p50 / p95 / p99", True, BUDGET_COLOR)
+        panel.blit(header, (4, 3))
+        for row, phase in enumerate(self.phases):
+            top = ROW_HEIGHT * (row + 1) + 3
+            panel.blit(font.render(phase, True, BUDGET_COLOR), (4, top))
+            for level in reversed(range(len(PERCENTILES))): # Breitester Balken zuerst
+                width = min(BAR_WIDTH, int(self.stats[level, row] * scale))
+                pygame.draw.rect(panel, BAR_COLORS[level], (label_width, top + 2, width, ROW_HEIGHT - 5))
+            values = " / ".join(f"{value / 1e6:.2f}" for value in self.stats[:, row])
+            panel.blit(font.render(values, True, BUDGET_COLOR), (label_width + BAR_WIDTH + 6, top))
+        pygame.draw.line(panel, BUDGET_COLOR, (label_width + BAR_WIDTH, ROW_HEIGHT), (label_width + BAR_WIDTH, height))
+        return panel
@@ -0,0 +1,63 @@
+# Qualitätsregler: passt die Effekte an die gemessene Frame-Zeit an.
+#
+# Die Spielschleife meldet pro Frame die Arbeitszeit (ohne das Warten in clock.tick).
+# Liegt das Mittel der letzten DOWNGRADE_FRAMES Frames über dem Budget, geht der Regler
+# sofort eine Stufe runter (z.B. beim Torjubel); erst wenn UPGRADE_FRAMES Frames lang im
+# Mittel genug Luft war, wieder eine Stufe rauf. Jede Stufe setzt die Regler in visuals
+# (Partikel-Anteil, Länge der Ballspur, Zuschauer) und ob kosmetische Passes (Ballspur,
+# Partikel zeichnen) laufen. self.level ist die aktuelle Stufe (0 = volle Qualität).
+import numpy as np
+
+import visuals
+
+LEVELS = (
+    # (Partikel-Anteil, Punkte der Ballspur, jeder n-te Zuschauer, kosmetische Passes)
+    (1.0, visuals.BALL_TRAIL_LENGTH, 1, True),
+    (0.5, 10, 1, True),
+    (0.25, 6, 2, True),
+    (0.0, 0, 4, False),
+)
+DOWNGRADE_FRAMES = 10
+DOWNGRADE_RATIO = 1.0  # Mittel über dem Budget -> eine Stufe runter
+UPGRADE_FRAMES = 120
+UPGRADE_RATIO = 0.6    # Mittel unter 60 % des Budgets -> eine Stufe rauf
+
+class QualityGovernor:
+    def __init__(self, frame_budget, enabled=True, level=0):
+        self.frame_budget = frame_budget
+        self.enabled = enabled
+        self.samples = np.zeros(UPGRADE_FRAMES)
+        self.frames = 0 # Gemessene Frames seit der letzten Änderung
+        self.changes = 0
+        self.level = level
+        self.apply()
+
+    @property
+    def cosmetics(self):
+        return LEVELS[self.level][3]
+
+    def update(self, frame_time):
+        """Arbeitszeit des letzten Frames (Sekunden) melden; liefert die Stufe"""
+        if not self.enabled:
+            return self.level
+        frames = self.frames
+        self.samples[frames % UPGRADE_FRAMES] = frame_time
+        self.frames = frames = frames + 1
+        if self.level < len(LEVELS) - 1 and frames >= DOWNGRADE_FRAMES:
+            recent = self.samples.take(range(frames - DOWNGRADE_FRAMES, frames), mode="wrap")
+            if recent.mean() > self.frame_budget * DOWNGRADE_RATIO:
+                self.set_level(self.level + 1)
+                return self.level
+        if self.level > 0 and frames >= UPGRADE_FRAMES and self.samples.mean() < self.frame_budget * UPGRADE_RATIO:
+            self.set_level(self.level - 1)
+        return self.level
+
+    def set_level(self, level):
+        self.level = min(max(level, 0), len(LEVELS) - 1)
+        self.frames = 0
+        self.changes += 1
+        self.apply()
+
+    def apply(self):
+        particle_fraction, trail_points, spectator_stride, _ = LEVELS[self.level]
+        visuals.set_quality(particle_fraction, trail_points, spectator_stride)
@@ -0,0 +1,230 @@
+"""Binäres Replay-Format: Aufzeichnung aus SoccerSim.step, Wiedergabe per mmap.
+
+Aufbau einer Datei (alle Zahlen little endian):
+    Kopf (HEADER_SIZE Bytes)   Magic, Version, Spielerzahl, dt, Anzahlen und Offsets
+    Frames                     frame_count feste Datensätze (frame_dtype)
+    Events                     event_count Datensätze (EVENT_DTYPE), nach Frame sortiert
+    Keyframes                  keyframe_count Datensätze (KEYFRAME_DTYPE)
+    Metadaten                  JSON (Namen, Seed, ...)
+
+Jeder Frame ist ein vollständiger Zustand, Springen ist also immer direkt möglich.
+Der Keyframe-Index markiert zusätzlich alle KEYFRAME_INTERVAL Frames und jeden Anstoß
+(nach Toren darf nicht interpoliert werden) und zeigt auf die Position in der Event-Tabelle.
+Der Kopf wird schon beim Öffnen vorläufig (ohne Offsets) geschrieben und in close()
+vervollständigt; eine nicht abgeschlossene Aufnahme liefert so alle bereits
+geschriebenen Frames. Replay öffnet die Datei per mmap; frames, events und keyframes sind NumPy-Sichten auf
+die Datei, es wird nichts kopiert.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python replay.py stats replays/*.replay
+"""
+import argparse
+import json
+import mmap
+import struct
+import time
+
+import numpy as np
+
+from simulation import EVENT_KICK, EVENT_TOUCH, EVENT_GOAL, SCREEN_WIDTH
+
+MAGIC = b"SREPLAY\0"
+VERSION = 1
+HEADER_FORMAT = "<8sIId8Q"
+HEADER_SIZE = 96
+KEYFRAME_INTERVAL = 60
+
+EVENT_CODES = {EVENT_KICK: 1, EVENT_TOUCH: 2, EVENT_GOAL: 3}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+EVENT_DTYPE = np.dtype([("frame", "<u4"), ("kind", "u1"), ("index", "u1")])
+KEYFRAME_DTYPE = np.dtype([("frame", "<u4"), ("event_offset", "<u4"), ("flags", "<u4")])
+KEYFRAME_PERIODIC = 1
+KEYFRAME_KICKOFF = 2
+
+def frame_dtype(num_players):
+    """Fester Datensatz pro Frame (ohne Padding)"""
+    return np.dtype([
+        ("time", "<f8"),
+        ("ball_pos", "<f4", (2,)), ("ball_vel", "<f4", (2,)),
+        ("player_pos", "<f4", (num_players, 2)), ("player_vel", "<f4", (num_players, 2)),
+        ("player_angle", "<f4", (num_players,)), ("player_sprint", "u1", (num_players,)),
+        ("score", "<u2", (2,)),
+    ])
+
+class ReplayRecorder:
+    """Schreibt die Frames einer SoccerSim mit; hängt sich als sim.recorder in step() ein"""
+
+    def __init__(self, path, sim, metadata=None, chunk_size=1024):
+        self.path = path
+        self.sim = sim
+        self.dt = sim.dt
+        self.num_players = len(sim.players)
+        self.chunk = np.zeros(chunk_size, dtype=frame_dtype(self.num_players))
+        self.filled = 0
+        self.frame_count = 0
+        self.events = []
+        self.keyframes = []
+        self.kickoff = True # Der erste Frame ist immer ein Anstoß
+        self.metadata = dict(metadata or {}, seed=sim.seed, team_size=sim.team_size)
+        self.file = open(path, "wb")
+        self._write_header(0, 0, 0, 0, 0, 0, 0, 0) # Vorläufig: events_offset = 0 heißt nicht abgeschlossen
+        sim.recorder = self
+
+    def mark_kickoff(self):
+        """Nächster Frame folgt auf einen Reset (reset_positions ruft das auf)"""
+        self.kickoff = True
+
+    def record(self, sim, events):
+        frame = self.frame_count
+        flags = 0
+        if frame % KEYFRAME_INTERVAL == 0: flags |= KEYFRAME_PERIODIC
+        if self.kickoff: flags |= KEYFRAME_KICKOFF; self.kickoff = False
+        if flags:
+            self.keyframes.append((frame, len(self.events), flags))
+        for kind, index in events:
+            self.events.append((frame, EVENT_CODES[kind], index))
+
+        row = self.chunk[self.filled]
+        ball = sim.ball
+        row["time"] = sim.time
+        row["ball_pos"] = (ball.pos.x, ball.pos.y)
+        row["ball_vel"] = (ball.velocity.x, ball.velocity.y)
+        for slot, player in enumerate(sim.players):
+            row["player_pos"][slot] = (player.pos.x, player.pos.y)
+            row["player_vel"][slot] = (player.velocity.x, player.velocity.y)
+            row["player_angle"][slot] = player.angle
+            row["player_sprint"][slot] = player.is_sprinting
+        row["score"] = (sim.score1, sim.score2)
+        self.filled += 1
+        self.frame_count += 1
+        if self.filled == len(self.chunk):
+            self._flush_frames()
+
+    def _flush_frames(self):
+        self.file.write(self.chunk[:self.filled].tobytes())
+        self.file.flush() # Ganze Blöcke sind sofort für Leser sichtbar
+        self.filled = 0
+
+    def _write_header(self, *counts_and_offsets):
+        header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.num_players, self.dt, *counts_and_offsets)
+        self.file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def close(self):
+        """Schreibt Events, Keyframes, Metadaten und den Kopf; löst den Recorder von der Simulation"""
+        if self.sim.recorder is self:
+            self.sim.recorder = None
+        self._flush_frames()
+        f = self.file
+        frames_offset = HEADER_SIZE
+        events_offset = f.tell()
+        f.write(np.array(self.events, dtype=EVENT_DTYPE).tobytes())
+        keyframes_offset = f.tell()
+        f.write(np.array(self.keyframes, dtype=KEYFRAME_DTYPE).tobytes())
+        meta_offset = f.tell()
+        meta = json.dumps(self.metadata).encode()
+        f.write(meta)
+        f.seek(0)
+        self._write_header(self.frame_count, len(self.events), len(self.keyframes),
+                           frames_offset, events_offset, keyframes_offset, meta_offset, len(meta))
+        f.close()
+
+class Replay:
+    """Liest eine Replay-Datei per mmap; frames/events/keyframes sind NumPy-Sichten ohne Kopie"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.num_players, self.dt, frame_count, event_count, keyframe_count,
+         frames_offset, events_offset, keyframes_offset, meta_offset, meta_length) = \
+            struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} ist keine Replay-Datei (Version {VERSION})")
+        self.dtype = frame_dtype(self.num_players)
+        if events_offset == 0: # Nicht abgeschlossene Aufnahme: nur die vollständigen Frames
+            frame_count = (len(self._mmap) - HEADER_SIZE) // self.dtype.itemsize
+            frames_offset = HEADER_SIZE
+        buffer = self._mmap
+        self.frames = np.frombuffer(buffer, dtype=self.dtype, count=frame_count, offset=frames_offset)
+        self.events = np.frombuffer(buffer, dtype=EVENT_DTYPE, count=event_count, offset=events_offset) \
+            if event_count else np.zeros(0, dtype=EVENT_DTYPE)
+        self.keyframes = np.frombuffer(buffer, dtype=KEYFRAME_DTYPE, count=keyframe_count, offset=keyframes_offset) \
+            if keyframe_count else np.zeros(0, dtype=KEYFRAME_DTYPE)
+        self.metadata = json.loads(bytes(buffer[meta_offset:meta_offset + meta_length])) if meta_length else {}
+
+    def __len__(self):
+        return len(self.frames)
+
+    # Spalten-Sichten (ebenfalls ohne Kopie)
+    @property
+    def ball_pos(self): return self.frames["ball_pos"]
+    @property
+    def ball_vel(self): return self.frames["ball_vel"]
+    @property
+    def player_pos(self): return self.frames["player_pos"]
+    @property
+    def player_angle(self): return self.frames["player_angle"]
+    @property
+    def player_sprint(self): return self.frames["player_sprint"]
+    @property
+    def score(self): return self.frames["score"]
+
+    def events_between(self, start, stop):
+        """Events der Frames start <= frame < stop (über den Keyframe-Index und Binärsuche)"""
+        frames = self.events["frame"]
+        return self.events[np.searchsorted(frames, start):np.searchsorted(frames, stop)]
+
+    def keyframe_before(self, frame):
+        """Letzter Keyframe-Eintrag mit keyframe.frame <= frame (oder None)"""
+        position = np.searchsorted(self.keyframes["frame"], frame, side="right") - 1
+        return self.keyframes[position] if position >= 0 else None
+
+    def kickoff_frames(self):
+        return self.keyframes["frame"][(self.keyframes["flags"] & KEYFRAME_KICKOFF) != 0]
+
+    def close(self):
+        # Sichten zuerst freigeben, sonst lässt sich das mmap nicht schließen
+        self.frames = self.events = self.keyframes = None
+        self._mmap.close()
+
+def new_contacts(events):
+    """Maske der Kontakt-Events, deren Spieler im Frame davor keinen Kontakt hatte (wie MatchStats)"""
+    contact = (events["kind"] == EVENT_CODES[EVENT_KICK]) | (events["kind"] == EVENT_CODES[EVENT_TOUCH])
+    keys = events["frame"].astype(np.int64) * 256 + events["index"]
+    previous = keys - 256
+    return contact & ~np.isin(previous, keys[contact])
+
+def replay_stats(replay):
+    """Kennzahlen eines Replays, vollständig vektorisiert"""
+    ball_x = replay.ball_pos[:, 0]
+    speed = np.hypot(replay.ball_vel[:, 0], replay.ball_vel[:, 1])
+    kinds = replay.events["kind"]
+    new = new_contacts(replay.events)
+    final = replay.score[-1] if len(replay) else (0, 0)
+    return {"frames": len(replay), "score_left": int(final[0]), "score_right": int(final[1]),
+            "ball_in_left_half": float(np.mean(ball_x < SCREEN_WIDTH / 2)) if len(replay) else 0.0,
+            "mean_ball_speed": float(speed.mean()) if len(replay) else 0.0,
+            "kicks": int(np.count_nonzero(new & (kinds == EVENT_CODES[EVENT_KICK]))), # Dribbeln zählt einmal
+            "goals": int(np.count_nonzero(kinds == EVENT_CODES[EVENT_GOAL]))}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    stats = commands.add_parser("stats", help="Kennzahlen über ein Archiv von Replays")
+    stats.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    totals = {}
+    for path in args.paths:
+        replay = Replay(path)
+        for key, value in replay_stats(replay).items():
+            totals[key] = totals.get(key, 0) + value
+        replay.close()
+    count = len(args.paths)
+    print(f"{count} Replays in {time.perf_counter() - start:.2f}s")
+    for key, value in totals.items():
+        print(f"{key:>20}: {value / count:12.3f} im Mittel")
+
+if __name__ == "__main__":
+    main()
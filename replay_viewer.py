@@ -0,0 +1,184 @@
+"""Replay-Viewer: spielt eine mit replay.py aufgezeichnete Datei ab, ohne neu zu simulieren.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python replay_viewer.py replays/bot_left__bot_right__0.replay [--speed 1] [--frame 0]
+
+Tasten:
+    Leertaste          Pause / weiter
+    Pfeil links/rechts pausiert: ein Frame zurück/vor, sonst 5 s zurück/vor
+    Pfeil hoch/runter  Geschwindigkeit (0.25x .. 16x)
+    Bild hoch/runter   vorheriger / nächster Anstoß (aus dem Keyframe-Index)
+    Pos1 / Ende        Anfang / Ende
+    Maus auf Zeitleiste  an diese Stelle springen
+    ESC                Beenden
+
+Jeder Frame der Datei ist ein vollständiger Zustand; Springen ist ein Indexzugriff auf
+die mmap-Sicht. Die Zustände werden in eine SoccerSim geschrieben, die nur als
+Zustandsbehälter für die Sprite-Adapter dient - step() wird nie aufgerufen.
+"""
+import argparse
+import sys
+
+import numpy as np
+import pygame
+
+import visuals
+from replay import Replay, EVENT_CODES
+from sprites import SimSprites, ROTATION_ATLAS, sprite_keys
+from simulation import (
+    SoccerSim, EVENT_GOAL,
+    SCREEN_WIDTH, SCREEN_HEIGHT, BALL_RADIUS, GOAL_WIDTH, GOAL_HEIGHT, TRIBUNE_HEIGHT, FPS,
+)
+
+NUM_SPECTATORS = 200
+SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16)
+SEEK_SECONDS = 5.0
+GOAL_BANNER_SECONDS = 1.5
+TIMELINE_HEIGHT = 12
+TIMELINE_COLOR = (90, 90, 90)
+TIMELINE_PLAYED_COLOR = (220, 220, 220)
+TIMELINE_GOAL_COLOR = (255, 200, 0)
+
+class ReplayView:
+    """Schreibt Frames eines Replays in eine SoccerSim (nur Zustand) für das Zeichnen"""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.sim = SoccerSim(dt=replay.dt, team_size=replay.metadata.get("team_size", 1))
+        self.kickoffs = replay.kickoff_frames()
+        goal_events = replay.events[replay.events["kind"] == EVENT_CODES[EVENT_GOAL]]
+        self.goal_frames = np.asarray(goal_events["frame"])
+        self.speed = np.hypot(replay.ball_vel[:, 0], replay.ball_vel[:, 1]) # Einmal vektorisiert für die Ballspur
+
+    def last_kickoff(self, index):
+        """Letzter Anstoß-Frame <= index: Über ihn hinweg wird nicht interpoliert"""
+        position = np.searchsorted(self.kickoffs, index, side="right") - 1
+        return int(self.kickoffs[position]) if position >= 0 else 0
+
+    def show(self, position):
+        """Zustand bei einer (gebrochenen) Frame-Position übernehmen"""
+        frames = self.replay.frames
+        index = min(int(position), len(frames) - 1)
+        alpha = position - index
+        if index + 1 >= len(frames) or self.last_kickoff(index + 1) == index + 1:
+            alpha = 0.0
+        current = frames[index]; following = frames[min(index + 1, len(frames) - 1)]
+        sim = self.sim
+        ball_pos = current["ball_pos"] + (following["ball_pos"] - current["ball_pos"]) * alpha
+        sim.ball.pos.update(float(ball_pos[0]), float(ball_pos[1]))
+        sim.ball.velocity.update(*map(float, current["ball_vel"]))
+        player_pos = current["player_pos"] + (following["player_pos"] - current["player_pos"]) * alpha
+        for slot, player in enumerate(sim.players):
+            player.pos.update(float(player_pos[slot, 0]), float(player_pos[slot, 1]))
+            player.angle = float(current["player_angle"][slot])
+            player.is_sprinting = bool(current["player_sprint"][slot])
+        sim.score1, sim.score2 = (int(value) for value in current["score"])
+        sim.time = float(current["time"])
+        sim.frame = index
+        self._rebuild_trail(index)
+        return index
+
+    def _rebuild_trail(self, index):
+        """Ballspur aus den letzten BALL_TRAIL_LENGTH Frames (höchstens bis zum letzten Anstoß)"""
+        start = max(self.last_kickoff(index), index - visuals.BALL_TRAIL_LENGTH)
+        first = index
+        while first > start and self.speed[first - 1] > visuals.BALL_TRAIL_MIN_SPEED: # Solange der Ball schnell war
+            first -= 1
+        trail = self.sim.ball.trail_positions
+        trail.clear()
+        for x, y in self.replay.ball_pos[first:index].tolist():
+            trail.append(x, y)
+
+    def goal_banner(self, index):
+        """True kurz nach einem Tor"""
+        position = np.searchsorted(self.goal_frames, index, side="right") - 1
+        return position >= 0 and (index - self.goal_frames[position]) * self.replay.dt < GOAL_BANNER_SECONDS
+
+def draw_scene(screen, view, sprites, index, main_font, menu_font):
+    """Spielfeld, Ballspur, Spieler, Spielstand und Torbanner des aktuellen Zustands der View"""
+    sim = view.sim
+    visuals.draw_background(screen, SCREEN_WIDTH, SCREEN_HEIGHT, TRIBUNE_HEIGHT, GOAL_WIDTH, GOAL_HEIGHT)
+    visuals.draw_ball_trail(screen, sim.ball.trail_positions, BALL_RADIUS)
+    sprites.sync()
+    sprites.draw(screen)
+    visuals.draw_text(screen, f"P1: {sim.score1} - P2: {sim.score2}", main_font, SCREEN_WIDTH / 2, TRIBUNE_HEIGHT / 2)
+    minutes = int(sim.time // 60); seconds = int(sim.time % 60)
+    visuals.draw_text(screen, f"{minutes:02}:{seconds:02}", main_font, SCREEN_WIDTH - 100, TRIBUNE_HEIGHT / 2)
+    if view.goal_banner(index):
+        visuals.draw_text(screen, "GOAL!", menu_font, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+
+def draw_timeline(screen, view, index):
+    total = max(1, len(view.replay) - 1)
+    top = SCREEN_HEIGHT - TIMELINE_HEIGHT
+    pygame.draw.rect(screen, TIMELINE_COLOR, (0, top, SCREEN_WIDTH, TIMELINE_HEIGHT))
+    pygame.draw.rect(screen, TIMELINE_PLAYED_COLOR, (0, top, int(SCREEN_WIDTH * index / total), TIMELINE_HEIGHT))
+    for frame in view.goal_frames:
+        x = int(SCREEN_WIDTH * frame / total)
+        pygame.draw.line(screen, TIMELINE_GOAL_COLOR, (x, top), (x, SCREEN_HEIGHT))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=1, choices=SPEEDS)
+    parser.add_argument("--frame", type=int, default=0, help="Start-Frame")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    replay = Replay(args.path)
+    if not len(replay):
+        sys.exit(f"{args.path} enthält keine Frames")
+    meta = replay.metadata
+    pygame.display.set_caption(f"Replay - {meta.get('left', 'Team 1')} vs {meta.get('right', 'Team 2')}")
+    clock = pygame.time.Clock()
+    main_font = pygame.font.Font(None, 50); menu_font = pygame.font.Font(None, 60); small_font = pygame.font.Font(None, 28)
+    visuals.generate_spectators(SCREEN_WIDTH, SCREEN_HEIGHT, TRIBUNE_HEIGHT, NUM_SPECTATORS)
+
+    view = ReplayView(replay)
+    ROTATION_ATLAS.prebuild(sprite_keys(view.sim), background=True)
+    all_sprites = SimSprites(view.sim)
+    last_frame = len(replay) - 1
+    position = float(min(max(args.frame, 0), last_frame))
+    speed_index = SPEEDS.index(args.speed)
+    paused = False
+    seek_frames = SEEK_SECONDS / replay.dt
+
+    running = True
+    while running:
+        frame_dt = clock.tick(FPS) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            elif event.type == pygame.KEYDOWN:
+                key = event.key
+                if key == pygame.K_ESCAPE: running = False
+                elif key == pygame.K_SPACE: paused = not paused
+                elif key == pygame.K_RIGHT: position = int(position) + 1 if paused else position + seek_frames
+                elif key == pygame.K_LEFT: position = int(position) - 1 if paused else position - seek_frames
+                elif key == pygame.K_UP: speed_index = min(speed_index + 1, len(SPEEDS) - 1)
+                elif key == pygame.K_DOWN: speed_index = max(speed_index - 1, 0)
+                elif key == pygame.K_HOME: position = 0
+                elif key == pygame.K_END: position = last_frame
+                elif key == pygame.K_PAGEUP:
+                    earlier = view.kickoffs[view.kickoffs < int(position)]
+                    position = int(earlier[-1]) if len(earlier) else 0
+                elif key == pygame.K_PAGEDOWN:
+                    later = view.kickoffs[view.kickoffs > int(position)]
+                    position = int(later[0]) if len(later) else last_frame
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.pos[1] >= SCREEN_HEIGHT - TIMELINE_HEIGHT:
+                position = event.pos[0] / SCREEN_WIDTH * last_frame
+        if not paused:
+            position += SPEEDS[speed_index] * frame_dt / replay.dt
+        position = min(max(position, 0.0), float(last_frame))
+        index = view.show(position)
+
+        draw_scene(screen, view, all_sprites, index, main_font, menu_font)
+        status = "Pause" if paused else f"{SPEEDS[speed_index]:g}x"
+        visuals.draw_text(screen, f"{status}  Frame {index}/{last_frame}", small_font, 110, TRIBUNE_HEIGHT / 2)
+        draw_timeline(screen, view, index)
+        pygame.display.flip()
+
+    replay.close()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
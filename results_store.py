@@ -0,0 +1,202 @@
+"""Ergebnis-Speicher für Spiele: gepufferte Schreibzugriffe in eine SQLite-Datei.
+
+Pro Runde wird eine Zeile in `rounds` geschrieben (Score, Ballbesitz, Schüsse,
+Berührungen, Reward), jedes Tor mit Zeitstempel in `goals`. Runden werden im
+Speicher gesammelt und in einer Transaktion geschrieben (batch_size bzw. spätestens
+nach flush_interval Sekunden). Mehrere Prozesse können in dieselbe Datei schreiben;
+SQLite läuft im WAL-Modus, Abfragen laufen über Indizes statt über die ganze Datei.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python results_store.py summary output/game_results.sqlite [--source bot_vs_bot]
+    python results_store.py export-csv output/game_results.sqlite game_results.csv
+"""
+import argparse
+import csv
+import sqlite3
+import time
+from datetime import datetime
+
+from simulation import EVENT_GOAL, EVENT_KICK, EVENT_TOUCH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    round INTEGER,
+    played_at TEXT,
+    left_name TEXT,
+    right_name TEXT,
+    duration REAL,
+    score_left INTEGER,
+    score_right INTEGER,
+    possession_left REAL,
+    possession_right REAL,
+    kicks_left INTEGER,
+    kicks_right INTEGER,
+    touches_left INTEGER,
+    touches_right INTEGER,
+    total_reward NUMERIC
+);
+CREATE TABLE IF NOT EXISTS goals (
+    round_id INTEGER NOT NULL,
+    time REAL NOT NULL,
+    team INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_source ON rounds (source);
+CREATE INDEX IF NOT EXISTS goals_round ON goals (round_id);
+"""
+
+ROUND_COLUMNS = ("source", "round", "played_at", "left_name", "right_name", "duration",
+                 "score_left", "score_right", "possession_left", "possession_right",
+                 "kicks_left", "kicks_right", "touches_left", "touches_right", "total_reward")
+
+class MatchStats:
+    """Sammelt Tore, Ballbesitz und Kontakte einer Runde aus den Events von SoccerSim.step"""
+
+    def __init__(self):
+        self.goals = []                  # (Spielzeit, Team)
+        self.possession = [0.0, 0.0]     # Sekunden, in denen Team 1/2 den Ball zuletzt berührt hat
+        self.kicks = [0, 0]              # Neue Kontakte; Dribbeln über mehrere Frames zählt einmal
+        self.touches = [0, 0]
+        self.owner = 0                   # Team mit dem letzten Kontakt (0 = niemand)
+        self.in_contact = set()          # Spieler-Indizes mit Kontakt im letzten Schritt
+
+    def record(self, sim, events, game_time, dt):
+        """Nach jedem Physik-Schritt aufrufen; game_time ist die Spielzeit der Runde"""
+        if self.owner:
+            self.possession[self.owner - 1] += dt
+        contact = set()
+        for event, index in events:
+            if event == EVENT_GOAL:
+                self.goals.append((round(game_time, 3), index))
+                self.owner = 0
+            elif event in (EVENT_KICK, EVENT_TOUCH):
+                team = sim.players[index].team
+                self.owner = team
+                contact.add(index)
+                if index in self.in_contact:
+                    continue
+                if event == EVENT_KICK: self.kicks[team - 1] += 1
+                else: self.touches[team - 1] += 1
+        self.in_contact = contact
+
+    def columns(self):
+        return {"possession_left": round(self.possession[0], 3), "possession_right": round(self.possession[1], 3),
+                "kicks_left": self.kicks[0], "kicks_right": self.kicks[1],
+                "touches_left": self.touches[0], "touches_right": self.touches[1]}
+
+class ResultsStore:
+    def __init__(self, path, batch_size=256, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = [] # (Runden-Spalten, Tore)
+        self.last_flush = time.monotonic()
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def add_round(self, source, score_left, score_right, stats=None, **columns):
+        """Merkt eine Runde zum Schreiben vor; weitere Spalten siehe ROUND_COLUMNS"""
+        row = {"source": source, "score_left": score_left, "score_right": score_right,
+               "played_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        if stats is not None:
+            row.update(stats.columns())
+        for key, value in columns.items():
+            if key not in ROUND_COLUMNS:
+                raise ValueError(f"Unbekannte Spalte {key}")
+            row[key] = value
+        self.pending.append((row, stats.goals if stats is not None else ()))
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Schreibt alle vorgemerkten Runden in einer Transaktion"""
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        connection = self.connection
+        with connection:
+            # IMMEDIATE sperrt die Datei für andere Schreiber, damit die Ids zusammenhängend bleiben
+            connection.execute("BEGIN IMMEDIATE")
+            next_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM rounds").fetchone()[0]
+            round_rows = []; goal_rows = []
+            for offset, (row, goals) in enumerate(self.pending):
+                round_id = next_id + offset
+                round_rows.append((round_id,) + tuple(row.get(column) for column in ROUND_COLUMNS))
+                goal_rows.extend((round_id, goal_time, team) for goal_time, team in goals)
+            connection.executemany(f"INSERT INTO rounds (id, {', '.join(ROUND_COLUMNS)}) "
+                                   f"VALUES ({', '.join('?' * (len(ROUND_COLUMNS) + 1))})", round_rows)
+            connection.executemany("INSERT INTO goals (round_id, time, team) VALUES (?, ?, ?)", goal_rows)
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    # --- Abfragen ---
+    def _where(self, source):
+        return ("WHERE source = ?", (source,)) if source is not None else ("", ())
+
+    def summary(self, source=None):
+        """Kennzahlen über alle (bzw. alle Runden einer Quelle) als dict"""
+        self.flush()
+        where, params = self._where(source)
+        row = self.connection.execute(f"""
+            SELECT COUNT(*),
+                   SUM(score_left > score_right), SUM(score_right > score_left), SUM(score_left = score_right),
+                   AVG(score_left), AVG(score_right),
+                   AVG(possession_left), AVG(possession_right),
+                   AVG(kicks_left), AVG(kicks_right)
+            FROM rounds {where}""", params).fetchone()
+        keys = ("rounds", "wins_left", "wins_right", "draws", "avg_goals_left", "avg_goals_right",
+                "avg_possession_left", "avg_possession_right", "avg_kicks_left", "avg_kicks_right")
+        return dict(zip(keys, row))
+
+    def goals_by_phase(self, phase_length=10.0, source=None):
+        """Tore je Spielphase: [(Phasenbeginn in s, Tore Team 1, Tore Team 2)]"""
+        self.flush()
+        where, params = self._where(source)
+        return self.connection.execute(f"""
+            SELECT CAST(goals.time / ? AS INTEGER) * ?, SUM(goals.team = 1), SUM(goals.team = 2)
+            FROM goals JOIN rounds ON rounds.id = goals.round_id {where}
+            GROUP BY 1 ORDER BY 1""", (phase_length, phase_length) + params).fetchall()
+
+    def export_csv(self, csv_path, source=None):
+        """Schreibt die Runden im Format der alten game_results.csv"""
+        self.flush()
+        where, params = self._where(source)
+        with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Runde", "Datum_Zeit", "Score_Bot_Left", "Score_Bot_Right", "Gewinner", "Total_Reward"])
+            for round_num, played_at, left, right, reward in self.connection.execute(
+                    f"SELECT round, played_at, score_left, score_right, total_reward FROM rounds {where} ORDER BY id", params):
+                winner = "Bot_Left" if left > right else "Bot_Right" if right > left else "Unentschieden"
+                writer.writerow([round_num, played_at, left, right, winner, reward])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary")
+    summary.add_argument("database")
+    summary.add_argument("--source")
+    summary.add_argument("--phase", type=float, default=10.0, help="Länge der Spielphasen für die Tor-Verteilung")
+    export = commands.add_parser("export-csv")
+    export.add_argument("database")
+    export.add_argument("csv_path")
+    export.add_argument("--source")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.database)
+    if args.command == "summary":
+        for key, value in store.summary(args.source).items():
+            print(f"{key:>22}: {value if value is not None else '-'}")
+        print("\nTore je Phase (Beginn s: Team 1 / Team 2)")
+        for start, left, right in store.goals_by_phase(args.phase, args.source):
+            print(f"{start:>8.0f}: {left} / {right}")
+    else:
+        store.export_csv(args.csv_path, args.source)
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,714 @@
+import pygame
+import math
+import random
+
+import visuals
+from broadphase import SpatialHash
+
+# --- Konstanten ---
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+DEFAULT_P1_COLOR = (0, 255, 255)  # Türkis
+DEFAULT_P2_COLOR = (255, 192, 203)  # Rosa
+
+# --- Einstellbare Parameter (jetzt feste Standardwerte) ---
+PLAYER_RADIUS = 15
+BALL_RADIUS = 10
+# ----------------------------
+
+PLAYER_ROTATION_SPEED = 180
+PLAYER_SPRINT_SPEED = 250
+BALL_FRICTION = 0.5
+BALL_KICK_MULTIPLIER = 1.1
+BALL_PUSH_STRENGTH = 50  # Sanfter Stoß, wenn nicht gesprintet wird
+BALL_STOP_SPEED = 0.5
+
+GOAL_HEIGHT = SCREEN_HEIGHT / 3
+GOAL_WIDTH = 10
+
+TRIBUNE_HEIGHT = 50
+
+FPS = 60
+
+# --- Spielfeld-Geometrie ---
+FIELD_TOP = TRIBUNE_HEIGHT
+FIELD_BOTTOM = SCREEN_HEIGHT - TRIBUNE_HEIGHT
+FIELD_LEFT = 0
+FIELD_RIGHT = SCREEN_WIDTH
+FIELD_CENTER_Y = FIELD_TOP + (FIELD_BOTTOM - FIELD_TOP) / 2
+GOAL_Y_START = FIELD_CENTER_Y - GOAL_HEIGHT / 2
+GOAL_Y_END = FIELD_CENTER_Y + GOAL_HEIGHT / 2
+
+# --- Events, die SoccerSim.step zurückgibt ---
+EVENT_KICK = "KICK"    # (EVENT_KICK, spieler_index)
+EVENT_TOUCH = "TOUCH"  # (EVENT_TOUCH, spieler_index)
+EVENT_GOAL = "GOAL"    # (EVENT_GOAL, 1 oder 2) - Team, das getroffen hat
+
+# Maximale Anzahl Ereignisse (Wand, Spieler, Tor) pro Schritt im Swept-Modus
+SWEEP_MAX_EVENTS = 8
+
+# Ab dieser Spielerzahl laufen die Kollisionen über das Gitter statt über alle Paare
+BROADPHASE_MIN_PLAYERS = 12
+
+# --- Checksummen (FNV-1a über quantisierte Zustandswerte) ---
+# Gleitkommawerte werden auf 1/CHECKSUM_SCALE Pixel (bzw. Grad) gerundet, damit die
+# skalare und die NumPy-Engine trotz Rundungsunterschieden dieselbe Summe liefern.
+CHECKSUM_SCALE = 1024
+CHECKSUM_OFFSET = 0xcbf29ce484222325
+CHECKSUM_PRIME = 0x100000001b3
+CHECKSUM_MASK = 0xFFFFFFFFFFFFFFFF
+
+def mix_checksum(checksum, words):
+    """Mischt ganzzahlige Zustandswörter in eine laufende 64-Bit Checksumme"""
+    for word in words:
+        checksum = ((checksum ^ (word & CHECKSUM_MASK)) * CHECKSUM_PRIME) & CHECKSUM_MASK
+    return checksum
+
+def kickoff_formation(team_size):
+    """Anstoßaufstellung als Liste (x, y, winkel): erst Team 1 (links), dann Team 2 (rechts).
+
+    Die Spieler eines Teams stehen in Spalten in der eigenen Hälfte; mit einem
+    Spieler pro Team ergibt das die Originalpositionen (1/4 bzw. 3/4 der Breite).
+    """
+    rows = math.ceil(math.sqrt(team_size))
+    columns = math.ceil(team_size / rows)
+    field_height = FIELD_BOTTOM - FIELD_TOP
+    left = []
+    for column in range(columns):
+        in_column = min(rows, team_size - column * rows)
+        x_fraction = 0.08 + (column + 0.5) * 0.34 / columns
+        for row in range(in_column):
+            left.append((x_fraction, FIELD_TOP + field_height * (row + 1) / (in_column + 1)))
+    return ([(SCREEN_WIDTH * x, y, 0) for x, y in left] +
+            [(SCREEN_WIDTH * (1 - x), y, 180) for x, y in left])
+
+# --- Klassen (Player, Ball) ---
+# Reine Zustands-Records mit __slots__: kein Surface, kein rect, kein __dict__.
+# Gezeichnet wird über die Adapter in sprites.py, die nur beim Rendern entstehen.
+class Player:
+    __slots__ = ("radius", "control_key", "color", "team", "pos", "velocity", "angle",
+                 "is_sprinting", "rotation_speed", "sprint_speed", "sprint_particle_timer")
+
+    def __init__(self, x, y, start_color, control_key, start_angle, team=1):
+        self.radius = PLAYER_RADIUS
+        self.control_key = control_key
+        self.color = start_color
+        self.team = team
+        self.pos = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0); self.angle = start_angle
+        self.is_sprinting = False
+        self.rotation_speed = PLAYER_ROTATION_SPEED
+        self.sprint_speed = PLAYER_SPRINT_SPEED
+        self.sprint_particle_timer = 0
+
+    def update_radius(self):
+        self.radius = PLAYER_RADIUS
+
+    def rotate(self, dt):
+        self.angle = (self.angle + self.rotation_speed * dt) % 360
+
+    def start_sprint(self): self.is_sprinting = True
+    def stop_sprint(self): self.is_sprinting = False; self.velocity = pygame.Vector2(0, 0)
+
+    def direction(self):
+        rad_angle = math.radians(self.angle)
+        return pygame.Vector2(math.cos(rad_angle), math.sin(rad_angle))
+
+    def update(self, dt, keys=None):
+        if self.is_sprinting:
+            self.velocity = self.direction() * self.sprint_speed
+            self.pos += self.velocity * dt
+        else:
+            self.rotate(dt)
+            self.velocity = pygame.Vector2(0, 0)
+        self.clamp_to_field()
+
+    def clamp_to_field(self):
+        # Korrektur der Position, damit der Kreis-Teil des Spielers im Feld bleibt
+        if self.pos.x - self.radius < FIELD_LEFT: self.pos.x = FIELD_LEFT + self.radius
+        if self.pos.x + self.radius > FIELD_RIGHT: self.pos.x = FIELD_RIGHT - self.radius
+        if self.pos.y - self.radius < FIELD_TOP: self.pos.y = FIELD_TOP + self.radius
+        if self.pos.y + self.radius > FIELD_BOTTOM: self.pos.y = FIELD_BOTTOM - self.radius
+
+    def reset(self, x, y, angle, start_color):
+         self.color = start_color
+         self.pos = pygame.Vector2(x, y)
+         self.angle = angle
+         self.is_sprinting = False
+         self.velocity = pygame.Vector2(0, 0)
+
+class TrailBuffer:
+    """Ringpuffer fester Größe für die Ballspur; Iteration liefert (x, y) von alt nach neu"""
+    __slots__ = ("capacity", "xs", "ys", "start", "count")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.xs = [0.0] * capacity; self.ys = [0.0] * capacity
+        self.start = 0; self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        xs = self.xs; ys = self.ys; capacity = self.capacity
+        for offset in range(self.count):
+            index = (self.start + offset) % capacity
+            yield xs[index], ys[index]
+
+    def append(self, x, y):
+        """Neue Position; ist der Puffer voll, fällt die älteste heraus"""
+        index = self.count
+        if index < self.capacity: # Bis der Puffer voll ist, bleibt start bei 0
+            self.count = index + 1
+        else:
+            index = self.start
+            self.start = index + 1 if index + 1 < self.capacity else 0
+        self.xs[index] = x; self.ys[index] = y
+
+    def clear(self):
+        self.start = 0; self.count = 0
+
+class Ball:
+    __slots__ = ("radius", "pos", "velocity", "friction_factor", "trail_positions")
+
+    def __init__(self, x, y):
+        self.radius = BALL_RADIUS
+        self.pos = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        self.friction_factor = BALL_FRICTION
+        self.trail_positions = TrailBuffer(visuals.BALL_TRAIL_LENGTH)
+
+    def update_radius(self):
+        self.radius = BALL_RADIUS
+
+    def apply_friction(self, dt):
+        self.velocity *= (self.friction_factor ** dt)
+        if self.velocity.length() < BALL_STOP_SPEED: self.velocity = pygame.Vector2(0, 0)
+
+    def record_trail(self):
+        if self.velocity.length() > visuals.BALL_TRAIL_MIN_SPEED: # Nur Spur zeichnen wenn schnell
+             self.trail_positions.append(self.pos.x, self.pos.y)
+        elif self.trail_positions: # Langsam geworden, Spur leeren
+            self.trail_positions.clear()
+
+    def update(self, dt, *args, **kwargs):
+        self.record_trail()
+        self.apply_friction(dt)
+        self.pos += self.velocity * dt
+
+        if self.pos.x - self.radius < FIELD_LEFT:
+            if not (GOAL_Y_START < self.pos.y < GOAL_Y_END):
+                self.pos.x = FIELD_LEFT + self.radius; self.velocity.x *= -1
+        if self.pos.x + self.radius > FIELD_RIGHT:
+             if not (GOAL_Y_START < self.pos.y < GOAL_Y_END):
+                self.pos.x = FIELD_RIGHT - self.radius; self.velocity.x *= -1
+        if self.pos.y - self.radius < FIELD_TOP:
+            self.pos.y = FIELD_TOP + self.radius; self.velocity.y *= -1
+        if self.pos.y + self.radius > FIELD_BOTTOM:
+            self.pos.y = FIELD_BOTTOM - self.radius; self.velocity.y *= -1
+
+    def reset(self):
+         self.pos = pygame.Vector2(SCREEN_WIDTH / 2, FIELD_CENTER_Y)
+         self.velocity = pygame.Vector2(0, 0)
+         self.trail_positions.clear()
+
+# --- Simulation ---
+class SoccerSim:
+    """Headless Spiel-Engine: Spieler, Ball, Kollisionen und Torerkennung ohne Display.
+
+    Die Engine öffnet kein Fenster und nutzt keine Fonts. Die Steuerung (Tastatur,
+    Bots, RL-Agent) setzt nur den Sprint-Zustand der Spieler, danach rückt step()
+    die Physik um einen festen Zeitschritt dt weiter. Mit effects=True werden die
+    Partikel-Effekte (Sprint-Spur, Schuss-Funken) wie im Originalspiel erzeugt.
+    Mit track_previous=True merkt sich die Engine die Positionen vor dem letzten
+    Schritt, damit das Rendering zwischen zwei Physik-Zuständen interpolieren kann.
+
+    Mit seed läuft die Simulation deterministisch: aller Zufall (Partikel, Konfetti)
+    kommt aus self.rng, Zeit ist nur self.time, und nach jedem Schritt wird
+    self.checksum als rollende Checksumme über den Physik-Zustand fortgeschrieben.
+
+    Mit swept=True wird der Ball kontinuierlich bewegt: Wände, Spieler und Torlinie
+    werden über den ganzen Weg des Schritts geprüft (Swept Circle) und in zeitlicher
+    Reihenfolge aufgelöst. So bleibt die Simulation auch mit dt = 1/10 .. 1/30 s
+    korrekt. Ohne swept gelten exakt die diskreten Regeln des Originalspiels.
+
+    team_size legt die Spieler pro Team fest (1 = Originalspiel, 3 = 3v3, 11 = 11v11).
+    self.players enthält erst Team 1, dann Team 2; ab BROADPHASE_MIN_PLAYERS Spielern
+    prüfen die Kollisionen nur Nachbarn aus einem Spatial Hash statt aller Paare.
+
+    Ruhige Phasen (Ball rollt frei, kein Spieler in der Nähe) kann skip() in einem
+    Sprung überspringen, solange die Steuerung ihre Eingaben hält: Ballweg und
+    Spielerbewegung werden dann in geschlossener Form statt Frame für Frame gerechnet.
+
+    Ist self.recorder gesetzt (z.B. replay.ReplayRecorder), ruft step() nach jedem
+    Schritt recorder.record(self, events) auf.
+    """
+
+    def __init__(self, dt=1.0 / FPS, effects=False, track_previous=False, seed=None, swept=False, team_size=1):
+        self.dt = dt
+        self.swept = swept
+        self.effects = effects
+        self.track_previous = track_previous
+        self.previous_positions = None
+        self.seed = seed
+        self.deterministic = seed is not None
+        self.rng = random.Random(seed)
+        self.frame = 0
+        self.checksum = CHECKSUM_OFFSET
+        self.team_size = team_size
+        self.players = []
+        for index, (x, y, angle) in enumerate(kickoff_formation(team_size)):
+            first_team = index < team_size
+            control_key = None
+            if index == 0: control_key = pygame.K_a
+            elif index == team_size: control_key = pygame.K_l
+            player = Player(x, y, DEFAULT_P1_COLOR if first_team else DEFAULT_P2_COLOR, control_key, angle,
+                            team=1 if first_team else 2)
+            self.players.append(player)
+        # player1/player2: jeweils erster Spieler von Team 1 bzw. Team 2
+        self.player1 = self.players[0]
+        self.player2 = self.players[team_size]
+        self.broadphase = SpatialHash(2 * PLAYER_RADIUS) if len(self.players) >= BROADPHASE_MIN_PLAYERS else None
+        self.ball = Ball(SCREEN_WIDTH / 2, FIELD_CENTER_Y)
+        self.score1 = 0; self.score2 = 0
+        self.time = 0.0
+        self.recorder = None
+
+    def reset_positions(self):
+        """Setzt Spieler und Ball auf die Anstoßpositionen zurück (Score bleibt)"""
+        for player in self.players:
+            player.update_radius()
+        self.ball.update_radius()
+        for player, (x, y, angle) in zip(self.players, kickoff_formation(self.team_size)):
+            player.reset(x, y, angle, DEFAULT_P1_COLOR if player.team == 1 else DEFAULT_P2_COLOR)
+        self.ball.reset()
+        self.previous_positions = None # Kein Interpolieren über einen Reset hinweg
+        if self.recorder is not None:
+            self.recorder.mark_kickoff()
+        if self.effects:
+            visuals.clear_particles()
+
+    def reset(self):
+        """Startet ein neues Spiel: Score, Zeit und Positionen zurücksetzen"""
+        self.score1 = 0; self.score2 = 0
+        self.time = 0.0
+        self.frame = 0
+        self.checksum = CHECKSUM_OFFSET
+        self.reset_positions()
+
+    def entities(self):
+        return self.players + [self.ball]
+
+    def interpolated_positions(self, alpha):
+        """Positionen aller Entities zwischen vorletztem und letztem Physik-Zustand (alpha 0..1)"""
+        if self.previous_positions is None:
+            return [entity.pos.copy() for entity in self.entities()]
+        return [previous.lerp(entity.pos, alpha)
+                for previous, entity in zip(self.previous_positions, self.entities())]
+
+    def stop_all(self):
+        for player in self.players:
+            player.stop_sprint()
+
+    def step(self, dt=None):
+        """Rückt die Physik um dt (Standard: self.dt) weiter und gibt die Events des Schritts zurück"""
+        if dt is None:
+            dt = self.dt
+        if self.track_previous:
+            self.previous_positions = [entity.pos.copy() for entity in self.entities()]
+        events = []
+        if self.swept:
+            player_starts = [player.pos.copy() for player in self.players]
+        for player in self.players:
+            player.update(dt)
+            if self.effects:
+                self._emit_sprint_trail(player, dt)
+
+        if self.swept:
+            self._sweep_ball(dt, player_starts, events)
+            self._resolve_player_collisions()
+        else:
+            self.ball.update(dt)
+            self._resolve_ball_collisions(events)
+            self._resolve_player_collisions()
+            self._check_goal(events)
+        self.time += dt
+        self.frame += 1
+        if self.deterministic:
+            self.checksum = mix_checksum(self.checksum, self.state_words())
+        if self.recorder is not None:
+            self.recorder.record(self, events)
+        return events
+
+    def state_words(self):
+        """Physik-Zustand als quantisierte Ganzzahlen (Reihenfolge wie BatchSoccerSim)"""
+        ball = self.ball
+        values = [ball.pos.x, ball.pos.y, ball.velocity.x, ball.velocity.y]
+        for player in self.players:
+            values += [player.pos.x, player.pos.y, player.angle]
+        words = [round(value * CHECKSUM_SCALE) for value in values]
+        words += [int(player.is_sprinting) for player in self.players]
+        words += [self.score1, self.score2]
+        return words
+
+    def skip(self, max_time):
+        """Springt bis zum nächsten Ereignis (höchstens max_time) vorwärts und gibt die übersprungene Zeit zurück.
+
+        Voraussetzung: Die Spieler halten ihren Sprint-Zustand. Übersprungen werden nur
+        ganze Frames, die auch mit step() nichts ausgelöst hätten; steht sofort ein
+        Ereignis an, ist das Ergebnis 0 und der Aufrufer rechnet mit step() weiter.
+        Mit effects=True oder einem Recorder wird nie gesprungen, da beide jeden Frame brauchen.
+        """
+        if self.effects or self.recorder is not None:
+            return 0.0
+        frames = self.quiet_frames(int(max_time / self.dt + 1e-9))
+        if frames <= 0:
+            return 0.0
+        self._advance_quiet(frames)
+        return frames * self.dt
+
+    def quiet_frames(self, max_frames):
+        """Anzahl Frames (<= max_frames), in denen bei gehaltenen Eingaben garantiert nichts passiert.
+
+        Ereignisse sind: Ball erreicht eine Wand bzw. die Torlinie, Ball bleibt liegen,
+        ein Spieler kommt in Reichweite des Balls oder eines anderen Spielers.
+        Die Grenzen werden analytisch bestimmt, Spieler-Abstände konservativ über die
+        Höchstgeschwindigkeit. Ein Frame Sicherheitsabstand fängt Rundung ab.
+        """
+        dt = self.dt; ball = self.ball; r = ball.radius
+        limit = max_frames
+        # Ball im Tor bzw. jenseits der Wandlinie: jeder Frame kann ein Tor sein
+        if not (FIELD_LEFT + r <= ball.pos.x <= FIELD_RIGHT - r and FIELD_TOP + r <= ball.pos.y <= FIELD_BOTTOM - r):
+            return 0
+        # Von einer Trennung über die Wand geschobene Spieler holt erst clamp_to_field im nächsten Frame zurück
+        for player in self.players:
+            pr = player.radius
+            if not (FIELD_LEFT + pr <= player.pos.x <= FIELD_RIGHT - pr and FIELD_TOP + pr <= player.pos.y <= FIELD_BOTTOM - pr):
+                return 0
+        speed = ball.velocity.length()
+        ball_step = 0.0 # Größter Ballweg pro Frame (der erste Frame, danach bremst die Reibung)
+        if speed > 0:
+            q = ball.friction_factor ** dt
+            if not 0 < q < 1:
+                return 0
+            # Liegenbleiben: |v0| * q**k < BALL_STOP_SPEED im Frame k
+            if speed < BALL_STOP_SPEED:
+                return 0
+            stop_frame = math.floor(math.log(BALL_STOP_SPEED / speed) / math.log(q)) + 1
+            limit = min(limit, stop_frame - 2)
+            factor = self._ball_path_factor(dt)
+            ball_step = speed * factor
+
+            def frames_within(distance, axis_speed):
+                # Größtes n mit axis_speed * factor * (1 - q**n) / (1 - q) <= distance
+                if distance < 0:
+                    return -1
+                if axis_speed <= 0:
+                    return max_frames
+                z = distance * (1 - q) / (axis_speed * factor)
+                if z >= 1:
+                    return max_frames
+                return math.floor(math.log(1 - z) / math.log(q)) - 1
+
+            # Wände und Torlinie: Vor dem Tor liegt immer erst die Wandlinie
+            vx, vy = ball.velocity.x, ball.velocity.y
+            x, y = ball.pos.x, ball.pos.y
+            limit = min(limit,
+                        frames_within(x - (FIELD_LEFT + r), -vx), frames_within((FIELD_RIGHT - r) - x, vx),
+                        frames_within(y - (FIELD_TOP + r), -vy), frames_within((FIELD_BOTTOM - r) - y, vy))
+
+        def frames_apart(gap, per_frame):
+            if gap <= 0:
+                return -1
+            if per_frame <= 0:
+                return max_frames
+            return math.floor(gap / per_frame) - 1
+
+        player_steps = [player.sprint_speed * dt if player.is_sprinting else 0.0 for player in self.players]
+        for player, player_step in zip(self.players, player_steps):
+            gap = ball.pos.distance_to(player.pos) - (player.radius + r)
+            limit = min(limit, frames_apart(gap, ball_step + player_step))
+        players = self.players
+        for i in range(len(players)):
+            for j in range(i + 1, len(players)):
+                gap = players[i].pos.distance_to(players[j].pos) - (players[i].radius + players[j].radius)
+                limit = min(limit, frames_apart(gap, player_steps[i] + player_steps[j]))
+        return max(0, limit)
+
+    def _ball_path_factor(self, dt):
+        """Ballweg pro Frame relativ zur Geschwindigkeit zu Beginn des Frames"""
+        f = self.ball.friction_factor
+        if self.swept:
+            return (1 - f ** dt) / -math.log(f) if f != 1 else dt
+        return dt * f ** dt # Diskret: erst Reibung, dann Bewegung
+
+    def _advance_quiet(self, frames):
+        """Rückt frames ruhige Frames vor (siehe quiet_frames).
+
+        Ohne seed springt die geschlossene Form in einem Schritt ans Ziel (gleich bis auf
+        Rundung). Mit seed muss die Checksumme jeden Frame sehen: Dann wird Frame für Frame
+        mit denselben Rechenschritten wie in step() fortgeschrieben, nur ohne die
+        Kollisionsprüfungen - bitgleich mit step(), aber weiter O(frames).
+        """
+        if self.track_previous:
+            self.previous_positions = None
+        if self.deterministic:
+            for _ in range(frames):
+                self._quiet_step(self.dt)
+                self.time += self.dt
+                self.frame += 1
+                self.checksum = mix_checksum(self.checksum, self.state_words())
+        else:
+            start = ([(player.pos.copy(), player.angle) for player in self.players],
+                     self.ball.pos.copy(), self.ball.velocity.copy())
+            self._quiet_state(start, frames)
+            self.time += frames * self.dt
+            self.frame += frames
+        self.ball.trail_positions.clear()
+
+    def _quiet_step(self, dt):
+        """Ein ruhiger Frame wie step(), ohne Kontakte (quiet_frames schließt sie aus)"""
+        for player in self.players:
+            player.update(dt)
+        ball = self.ball
+        if not self.swept:
+            ball.update(dt) # Wandprüfung greift nicht, der Ball bleibt im Feld
+            return
+        # Wie _sweep_ball ohne Ereignis
+        decay = ball.friction_factor ** dt
+        ball.pos += ball.velocity * self._ball_path_factor(dt)
+        ball.velocity *= decay
+        if ball.velocity.length() < BALL_STOP_SPEED: ball.velocity = pygame.Vector2(0, 0)
+
+    def _quiet_state(self, start, frames):
+        """Zustand frames ruhige Frames nach start (Spieler, Ballposition, Ballgeschwindigkeit)"""
+        dt = self.dt; span = frames * dt
+        player_starts, ball_pos, ball_velocity = start
+        for player, (pos, angle) in zip(self.players, player_starts):
+            if player.is_sprinting: # Geradeaus; Wandkontakt hält nur die Koordinate fest
+                player.velocity = player.direction() * player.sprint_speed
+                player.pos = pos + player.velocity * span
+                player.clamp_to_field()
+            else:
+                player.angle = angle
+                player.rotate(span)
+                player.velocity = pygame.Vector2(0, 0)
+        ball = self.ball
+        if ball_velocity.length_squared() > 0:
+            # Geometrische Reihe über die Frames: Weg = v0 * factor * (1 - q**n) / (1 - q)
+            q = ball.friction_factor ** dt
+            decay = q ** frames
+            ball.pos = ball_pos + ball_velocity * (self._ball_path_factor(dt) * (1 - decay) / (1 - q))
+            ball.velocity = ball_velocity * decay
+
+    def _emit_sprint_trail(self, player, dt):
+        player.sprint_particle_timer -= dt
+        if player.is_sprinting and player.sprint_particle_timer <= 0:
+            particle_pos = player.pos - player.direction() * player.radius # Partikel von hinten
+            visuals.emit_particles(2, particle_pos, (220, 220, 220), vel_range=(-40, 40), life_range=(0.2, 0.5), radius_range=(2, 4), rng=self.rng)
+            player.sprint_particle_timer = 0.02
+
+    def _resolve_ball_collisions(self, events):
+        ball = self.ball
+        players = self.players
+        if self.broadphase is None:
+            candidates = range(len(players))
+        else:
+            self.broadphase.rebuild([player.pos for player in players])
+            candidates = self.broadphase.query(ball.pos, ball.radius + PLAYER_RADIUS)
+        # Wie spritecollide: erst alle berührenden Spieler sammeln, dann auflösen
+        collided = [(index, players[index]) for index in candidates
+                    if ball.pos.distance_squared_to(players[index].pos) < (players[index].radius + ball.radius) ** 2]
+        for index, player in collided:
+            distance_vec = ball.pos - player.pos; distance = distance_vec.length()
+            if distance == 0: collision_normal = pygame.Vector2(1, 0)
+            else: collision_normal = distance_vec / distance
+
+            if player.is_sprinting:
+                ball.velocity = collision_normal * (player.sprint_speed * BALL_KICK_MULTIPLIER)
+                events.append((EVENT_KICK, index))
+                if self.effects:
+                    visuals.emit_particles(8, ball.pos, (255, 255, 100), vel_range=(-80, 80), life_range=(0.1, 0.4), radius_range=(1, 3), rng=self.rng)
+            else: # Sanfter Stoß, wenn nicht gesprintet wird
+                ball.velocity += collision_normal * BALL_PUSH_STRENGTH
+                events.append((EVENT_TOUCH, index))
+
+            # Kollisionsauflösung (Overlap entfernen)
+            overlap = (player.radius + ball.radius) - distance
+            if overlap > 0.1: # Kleiner Puffer, um Jitter zu vermeiden
+                 correction_vec = collision_normal * overlap
+                 ball.pos += correction_vec * 0.51 # Ball etwas mehr bewegen
+                 player.pos -= correction_vec * 0.5 # Spieler etwas weniger
+
+    def _sweep_ball(self, dt, player_starts, events):
+        """Bewegt den Ball kontinuierlich durch den Schritt und löst Ereignisse in zeitlicher Reihenfolge auf.
+
+        Zeit wird als Anteil u des Schritts (0..1) gemessen. Die Spieler bewegen sich
+        linear von player_starts zu ihrer (bereits berechneten) Endposition.
+        """
+        ball = self.ball
+        ball.record_trail()
+        # Exakter Weg unter Reibung: v(t) = v0 * f**t  =>  Weg = v0 * (1 - f**dt) / -ln(f).
+        # Der Ball fährt diesen Weg mit konstanter Ersatzgeschwindigkeit, am Ende wird v0 gedämpft.
+        decay = ball.friction_factor ** dt
+        path_factor = (1 - decay) / -math.log(ball.friction_factor) if ball.friction_factor != 1 else dt
+        moves = [(start, player.pos - start) for start, player in zip(player_starts, self.players)]
+        touched = set()
+        u = 0.0
+        for _ in range(SWEEP_MAX_EVENTS):
+            displacement = ball.velocity * path_factor # Ballweg pro ganzen Schritt
+            hit_u, kind, data = self._next_ball_event(u, displacement, moves, touched)
+            if kind is None:
+                break
+            ball.pos += displacement * (hit_u - u)
+            u = hit_u
+            if kind == EVENT_GOAL:
+                if data == 2: self.score2 += 1
+                else: self.score1 += 1
+                events.append((EVENT_GOAL, data))
+                return
+            if kind == "WALL_X":
+                ball.pos.x = data; ball.velocity.x *= -1
+            elif kind == "WALL_Y":
+                ball.pos.y = data; ball.velocity.y *= -1
+            else:
+                index = data
+                start, move = moves[index]
+                touched.add(index)
+                # ball.velocity gilt für den Anfang des Schritts; der Kontakt braucht die
+                # Geschwindigkeit zum Zeitpunkt u, die neue wird wieder zurückgerechnet,
+                # damit die Dämpfung am Ende nur den Rest des Schritts wirkt
+                elapsed = ball.friction_factor ** (u * dt)
+                ball.velocity *= elapsed
+                self._ball_player_contact(index, start + move * u, move / dt, events)
+                ball.velocity /= elapsed
+        else:
+            displacement = ball.velocity * path_factor
+        ball.pos += displacement * (1.0 - u)
+        ball.velocity *= decay
+        if ball.velocity.length() < BALL_STOP_SPEED: ball.velocity = pygame.Vector2(0, 0)
+
+    def _next_ball_event(self, u, displacement, moves, touched):
+        """Frühestes Ereignis im Rest des Schritts: (u, art, daten) oder (1, None, None)"""
+        ball = self.ball; r = ball.radius
+        best = (1.0, None, None)
+        remaining = 1.0 - u
+
+        def consider(distance, speed, kind, data):
+            nonlocal best
+            # distance: Weg bis zur Grenze, speed: Bewegung pro Schritt in diese Richtung
+            if speed <= 0:
+                return
+            hit = u + max(0.0, distance / speed)
+            if hit <= u + remaining and hit < best[0]:
+                best = (hit, kind, data)
+
+        def y_at(hit):
+            return ball.pos.y + displacement.y * (hit - u)
+
+        # Seitenwände - innerhalb der Torbreite fliegt der Ball bis zur Torlinie weiter
+        for side in (-1, 1):
+            speed = -displacement.x if side < 0 else displacement.x
+            if speed <= 0:
+                continue
+            wall_x = FIELD_LEFT + r if side < 0 else FIELD_RIGHT - r
+            goal_x = GOAL_WIDTH - r if side < 0 else SCREEN_WIDTH - GOAL_WIDTH + r
+            wall_distance = (ball.pos.x - wall_x) if side < 0 else (wall_x - ball.pos.x)
+            wall_hit = u + max(0.0, wall_distance / speed)
+            if wall_hit <= 1.0 and not (GOAL_Y_START < y_at(wall_hit) < GOAL_Y_END):
+                consider(wall_distance, speed, "WALL_X", wall_x)
+                continue
+            goal_distance = (ball.pos.x - goal_x) if side < 0 else (goal_x - ball.pos.x)
+            goal_hit = u + max(0.0, goal_distance / speed)
+            if goal_hit <= 1.0:
+                if GOAL_Y_START < y_at(goal_hit) < GOAL_Y_END:
+                    consider(goal_distance, speed, EVENT_GOAL, 2 if side < 0 else 1)
+                else: # Im Tor seitlich an den Pfosten geraten: wie eine Wand behandeln
+                    consider(goal_distance, speed, "WALL_X", wall_x)
+
+        # Ober- und Unterkante
+        consider(ball.pos.y - (FIELD_TOP + r), -displacement.y, "WALL_Y", FIELD_TOP + r)
+        consider((FIELD_BOTTOM - r) - ball.pos.y, displacement.y, "WALL_Y", FIELD_BOTTOM - r)
+
+        # Spieler: Kreis gegen Kreis mit relativer Bewegung
+        for index, (start, move) in enumerate(moves):
+            if index in touched:
+                continue
+            player = self.players[index]
+            reach = player.radius + r
+            rel_pos = ball.pos - (start + move * u)
+            rel_move = displacement - move
+            c = rel_pos.length_squared() - reach * reach
+            if c < 0: # Überlappen bereits
+                hit = u
+            else:
+                a = rel_move.length_squared()
+                b = 2 * rel_pos.dot(rel_move)
+                disc = b * b - 4 * a * c
+                if a == 0 or b >= 0 or disc < 0:
+                    continue
+                hit = u + (-b - math.sqrt(disc)) / (2 * a)
+            if hit <= 1.0 and hit < best[0]:
+                best = (hit, "PLAYER", index)
+        return best
+
+    def _ball_player_contact(self, index, player_pos, player_velocity, events):
+        """Schuss bzw. sanfter Stoß beim Kontakt (Regeln wie _resolve_ball_collisions)"""
+        ball = self.ball; player = self.players[index]
+        distance_vec = ball.pos - player_pos; distance = distance_vec.length()
+        if distance == 0: collision_normal = pygame.Vector2(1, 0)
+        else: collision_normal = distance_vec / distance
+
+        if player.is_sprinting:
+            ball.velocity = collision_normal * (player.sprint_speed * BALL_KICK_MULTIPLIER)
+            events.append((EVENT_KICK, index))
+            if self.effects:
+                visuals.emit_particles(8, ball.pos, (255, 255, 100), vel_range=(-80, 80), life_range=(0.1, 0.4), radius_range=(1, 3), rng=self.rng)
+        else:
+            ball.velocity += collision_normal * BALL_PUSH_STRENGTH
+            events.append((EVENT_TOUCH, index))
+
+        # Läuft der Ball weiter in den Spieler hinein, bleibt er an dessen Rand hängen.
+        # Diskret übernimmt das die Overlap-Korrektur in jedem Frame; hier würde der
+        # Ball sonst im Rest des Schritts durch den Spieler hindurchfliegen.
+        approach = (ball.velocity - player_velocity).dot(collision_normal)
+        if approach < 0:
+            ball.velocity -= collision_normal * approach
+
+        overlap = (player.radius + ball.radius) - distance
+        if overlap > 0.1: # Nur wenn sie zu Beginn schon überlappten
+            correction_vec = collision_normal * overlap
+            ball.pos += correction_vec * 0.51
+            player.pos -= correction_vec * 0.5
+
+    def _resolve_player_collisions(self):
+        players = self.players
+        if self.broadphase is not None: # Paare aus Nachbarzellen, in derselben Reihenfolge wie alle Paare
+            self.broadphase.rebuild([player.pos for player in players])
+            for i, j in self.broadphase.pairs():
+                self._separate_players(players[i], players[j])
+            return
+        for i in range(len(players)):
+            for j in range(i + 1, len(players)):
+                self._separate_players(players[i], players[j])
+
+    @staticmethod
+    def _separate_players(player_a, player_b):
+        dist_vec = player_b.pos - player_a.pos
+        dist = dist_vec.length()
+        if dist < (player_a.radius + player_b.radius) and dist > 0: # dist > 0 um Division durch Null zu vermeiden
+            correction_normal = dist_vec / dist
+            overlap = (player_a.radius + player_b.radius) - dist
+            player_a.pos -= correction_normal * overlap / 2
+            player_b.pos += correction_normal * overlap / 2
+
+    def _check_goal(self, events):
+        ball = self.ball
+        if not (GOAL_Y_START < ball.pos.y < GOAL_Y_END):
+            return
+        if ball.pos.x + ball.radius < GOAL_WIDTH: # Linkes Tor -> Punkt für Player 2
+            self.score2 += 1
+            events.append((EVENT_GOAL, 2))
+        elif ball.pos.x - ball.radius > SCREEN_WIDTH - GOAL_WIDTH: # Rechtes Tor -> Punkt für Player 1
+            self.score1 += 1
+            events.append((EVENT_GOAL, 1))
@@ -0,0 +1,119 @@
+# Sprite-Adapter für die Zustands-Records aus simulation.py
+#
+# Die Simulation kennt keine Surfaces. Erst wenn gezeichnet wird, entsteht pro Entity
+# ein Adapter, der Avatar und rect aus dem Zustand ableitet. Gedrehte Avatare kommen
+# aus dem gemeinsamen ROTATION_ATLAS; der Adapter holt nur dann ein neues Bild, wenn
+# sich Farbe, Radius oder Winkel tatsächlich geändert haben.
+import threading
+
+import pygame
+
+import visuals
+
+ROTATION_STEP = 2 # Grad zwischen zwei vorgerenderten Drehungen (1 = feiner, doppelter Speicher)
+
+class RotationAtlas:
+    """Gedrehte Avatare je (Farbe, Radius) in ROTATION_STEP-Schritten, von allen Adaptern geteilt.
+
+    Bilder entstehen beim ersten Zugriff; prebuild() rechnet alle Winkel vorab,
+    auf Wunsch in einem Hintergrund-Thread. Fehlt ein Winkel noch, dreht image()
+    ihn sofort selbst (beide Wege liefern dasselbe Bild).
+    """
+
+    def __init__(self, step=ROTATION_STEP):
+        self.step = step
+        self.count = int(round(360 / step))
+        self.entries = {} # (Farbe, Radius) -> (Avatar, [gedrehte Bilder oder None])
+        self.lock = threading.Lock()
+
+    def _entry(self, color, radius):
+        key = (tuple(color), radius)
+        entry = self.entries.get(key)
+        if entry is None:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is None:
+                    entry = self.entries[key] = (visuals.create_player_avatar(color, radius), [None] * self.count)
+        return entry
+
+    def image(self, color, radius, angle):
+        avatar, images = self._entry(color, radius)
+        index = int(round(angle / self.step)) % self.count
+        image = images[index]
+        if image is None:
+            image = images[index] = pygame.transform.rotate(avatar, -index * self.step)
+        return image
+
+    def prebuild(self, keys, background=False):
+        """Alle Winkel für die (Farbe, Radius)-Paare rechnen; mit background=True im Thread"""
+        def build():
+            for color, radius in keys:
+                for index in range(self.count):
+                    self.image(color, radius, index * self.step)
+        if not background:
+            build()
+            return None
+        thread = threading.Thread(target=build, name="rotation-atlas", daemon=True)
+        thread.start()
+        return thread
+
+ROTATION_ATLAS = RotationAtlas()
+
+class PlayerSprite(pygame.sprite.Sprite):
+    def __init__(self, player):
+        super().__init__()
+        self.player = player
+        self.color = None; self.radius = None; self.angle = None
+        self.image = None; self.rect = None
+        self.sync()
+
+    def sync(self, pos=None):
+        """Bild und rect an den Zustand anpassen (pos: abweichende Zeichenposition, z.B. interpoliert)"""
+        player = self.player
+        if player.angle != self.angle or player.color != self.color or player.radius != self.radius:
+            self.color = player.color; self.radius = player.radius; self.angle = player.angle
+            self.image = ROTATION_ATLAS.image(self.color, self.radius, self.angle)
+            # Gedrehte Bilder sind unterschiedlich groß
+            self.rect = self.image.get_rect()
+        self.rect.center = player.pos if pos is None else pos
+
+class BallSprite(pygame.sprite.Sprite):
+    def __init__(self, ball):
+        super().__init__()
+        self.ball = ball
+        self.radius = None; self.image = None; self.rect = None
+        self.sync()
+
+    def sync(self, pos=None):
+        ball = self.ball
+        if ball.radius != self.radius:
+            self.radius = ball.radius
+            self.image = visuals.create_ball_image(self.radius)
+            self.rect = self.image.get_rect()
+        self.rect.center = ball.pos if pos is None else pos
+
+class SimSprites(pygame.sprite.Group):
+    """Sprite-Gruppe für alle Entities einer SoccerSim (Reihenfolge wie sim.entities())"""
+
+    def __init__(self, sim):
+        """Gedrehte Avatare entstehen bei Bedarf (vorab: ROTATION_ATLAS.prebuild(sprite_keys(sim)))"""
+        self.sim = sim
+        self.adapters = [PlayerSprite(player) for player in sim.players] + [BallSprite(sim.ball)]
+        super().__init__(*self.adapters)
+
+    def sync(self, positions=None):
+        """Alle Adapter aktualisieren; positions wie sim.interpolated_positions()"""
+        if positions is None:
+            for adapter in self.adapters:
+                adapter.sync()
+        else:
+            for adapter, pos in zip(self.adapters, positions):
+                adapter.sync(pos)
+
+    def rects(self):
+        """Aktuelle Zeichenbereiche aller Adapter (Kopien)"""
+        return [adapter.rect.copy() for adapter in self.adapters]
+
+def sprite_keys(sim):
+    """(Farbe, Radius)-Paare aller Spieler einer Simulation, z.B. für ROTATION_ATLAS.prebuild"""
+    return sorted({(tuple(player.color), player.radius) for player in sim.players})
@@ -0,0 +1,114 @@
+"""Telemetrie: Frame-Werte stichprobenartig in einen Ringpuffer, Schreiben im Hintergrund.
+
+Die Spielschleife ruft pro Frame record(frame, values) auf. Nur jeder sample_every-te
+Frame landet als Zeile im vorab angelegten Ringpuffer (NumPy, capacity Zeilen). Ein
+Hintergrund-Thread schreibt die Zeilen in Blöcken als JSON-Lines oder binär weg.
+Ist der Puffer voll, weil die Platte hängt, wird die Stichprobe verworfen und in
+self.dropped gezählt - die Spielschleife wartet nie auf stdout oder die Platte.
+
+Binärformat: eine Kopfzeile "#telemetry <feld>,<feld>,...\\n", danach float64-Zeilen
+(little endian) mit frame als erster Spalte. read_telemetry() liest beide Formate.
+"""
+import json
+import threading
+
+import numpy as np
+
+BINARY_MAGIC = b"#telemetry "
+
+class Telemetry:
+    def __init__(self, path, fields, sample_every=6, capacity=4096, batch_size=256,
+                 binary=False, flush_interval=0.5):
+        self.path = path
+        self.fields = ("frame",) + tuple(fields)
+        self.sample_every = max(1, sample_every)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.binary = binary
+        self.flush_interval = flush_interval
+        self.buffer = np.zeros((capacity, len(self.fields)), dtype="<f8")
+        self.head = 0 # Nächste Schreibposition (nur Spielschleife)
+        self.tail = 0 # Nächste Leseposition (nur Writer-Thread)
+        self.dropped = 0
+        self.written = 0
+        self._wake = threading.Event()
+        self._stop = False
+        self._file = open(path, "ab" if binary else "a", encoding=None if binary else "utf-8")
+        if binary and self._file.tell() == 0:
+            self._file.write(BINARY_MAGIC + ",".join(self.fields).encode() + b"\n")
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def wants(self, frame):
+        """True, wenn dieser Frame eine Stichprobe ist (Werte nur dann zusammenstellen)"""
+        return frame % self.sample_every == 0
+
+    def record(self, frame, values):
+        """Legt eine Stichprobe ab; values in der Reihenfolge von fields"""
+        if not self.wants(frame):
+            return
+        if self.head - self.tail >= self.capacity:
+            self.dropped += 1 # Writer kommt nicht hinterher: verwerfen statt warten
+            return
+        row = self.buffer[self.head % self.capacity]
+        row[0] = frame
+        row[1:] = values
+        self.head += 1
+        if self.head - self.tail >= self.batch_size:
+            self._wake.set()
+
+    def close(self):
+        """Restliche Zeilen schreiben und den Writer beenden"""
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stop
+            self._drain()
+            if stopping:
+                return
+
+    def _drain(self):
+        head = self.head # Stand einfrieren; neue Zeilen kommen in die nächste Runde
+        if head == self.tail:
+            return
+        start = self.tail % self.capacity; count = head - self.tail
+        if start + count <= self.capacity:
+            rows = self.buffer[start:start + count].copy()
+        else:
+            rows = np.concatenate([self.buffer[start:], self.buffer[:start + count - self.capacity]])
+        self.tail = head # Erst nach dem Kopieren freigeben
+        if self.binary:
+            self._file.write(rows.tobytes())
+        else:
+            fields = self.fields[1:]
+            self._file.write("".join(json.dumps({"frame": int(row[0]), **dict(zip(fields, row[1:]))}) + "\n"
+                                     for row in rows.tolist()))
+        self._file.flush()
+        self.written += count
+
+def read_telemetry(path):
+    """Liest eine Telemetrie-Datei als NumPy-Array mit benannten Feldern"""
+    with open(path, "rb") as f:
+        first = f.readline()
+        if first.startswith(BINARY_MAGIC):
+            fields = first[len(BINARY_MAGIC):].decode().strip().split(",")
+            data = np.frombuffer(f.read(), dtype="<f8")
+            rows = data[:len(data) // len(fields) * len(fields)].reshape(-1, len(fields)) # Abgebrochene Zeile ignorieren
+            return rows.view([(name, "<f8") for name in fields]).ravel()
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    if not rows:
+        return np.zeros(0)
+    fields = list(rows[0])
+    return np.array([tuple(row[name] for name in fields) for row in rows], dtype=[(name, "<f8") for name in fields])
@@ -0,0 +1,10 @@
+# Tests laufen aus dem Hauptverzeichnis: python -m pytest -q
+# Die Module liegen flach im Hauptverzeichnis bzw. in ai/; pygame ohne Fenster.
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "ai"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
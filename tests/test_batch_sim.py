@@ -0,0 +1,56 @@
+"""BatchSoccerSim muss bei gleichen Sprint-Eingaben dieselben Zustände wie SoccerSim liefern."""
+import numpy as np
+import pytest
+
+from batch_sim import BatchSoccerSim
+from simulation import SoccerSim, EVENT_GOAL
+
+TOLERANCE = 1e-6
+
+def sprint_inputs(num_steps, num_matches, num_players, seed=0):
+    """Sprint-Entscheidungen, die nur gelegentlich wechseln, damit es zu Schüssen kommt"""
+    rng = np.random.default_rng(seed)
+    toggles = rng.random((num_steps, num_matches, num_players)) < 0.03
+    return np.logical_xor.accumulate(toggles, axis=0)
+
+def scalar_state(sim):
+    state = [sim.ball.pos.x, sim.ball.pos.y, sim.ball.velocity.x, sim.ball.velocity.y]
+    for player in sim.players:
+        state += [player.pos.x, player.pos.y, player.angle]
+    return np.asarray(state)
+
+def batch_state(batch, m):
+    return np.concatenate([batch.ball_pos[m], batch.ball_vel[m],
+                           np.column_stack([batch.player_pos[m], batch.player_angle[m]]).ravel()])
+
+@pytest.mark.parametrize("team_size, num_steps", [(1, 600), (2, 300)])
+def test_batch_matches_scalar(team_size, num_steps):
+    num_matches = 8
+    batch = BatchSoccerSim(num_matches, checksums=True, team_size=team_size)
+    sims = [SoccerSim(seed=m, team_size=team_size) for m in range(num_matches)]
+    sprint = sprint_inputs(num_steps, num_matches, batch.num_players)
+    for step in range(num_steps):
+        goals = batch.step(sprint[step])
+        for m, sim in enumerate(sims):
+            for slot, player in enumerate(sim.players):
+                if sprint[step, m, slot]: player.start_sprint()
+                else: player.stop_sprint()
+            events = sim.step()
+            assert next((team for event, team in events if event == EVENT_GOAL), 0) == goals[m], (m, step)
+            np.testing.assert_allclose(batch_state(batch, m), scalar_state(sim), rtol=0, atol=TOLERANCE,
+                                       err_msg=f"Match {m}, Schritt {step}")
+        if goals.any():
+            batch.reset_positions(goals > 0)
+            for m in np.flatnonzero(goals):
+                sims[m].reset_positions()
+    assert [sim.checksum for sim in sims] == [int(value) for value in batch.checksum]
+
+def test_reset_positions_mask_only_resets_selected_matches():
+    batch = BatchSoccerSim(3)
+    for _ in range(30):
+        batch.step(np.ones((3, 2), dtype=bool))
+    moved = batch.player_pos.copy()
+    batch.reset_positions(np.array([False, True, False]))
+    np.testing.assert_array_equal(batch.player_pos[[0, 2]], moved[[0, 2]])
+    assert not np.array_equal(batch.player_pos[1], moved[1])
+    assert not batch.player_sprint[1].any()
@@ -0,0 +1,42 @@
+"""Gitter-Beobachtungen: FrameStack-Reihenfolge, Teams im Batch und SoccerEnv im Gitter-Modus."""
+import numpy as np
+from gymnasium.utils.env_checker import check_env
+
+from batch_sim import BatchSoccerSim
+from grid_observation import GridRasterizer, FrameStack, CHANNELS
+from rl_env import SoccerEnv
+from simulation import SoccerSim
+
+TEAM1, TEAM2 = CHANNELS.index("team1"), CHANNELS.index("team2")
+
+def test_frame_stack_keeps_oldest_first():
+    stack = FrameStack(2, (1, 2, 2), depth=3)
+    for value in range(1, 6):
+        view = stack.push(lambda out, value=value: out.fill(value))
+    assert view.shape == (2, 3, 2, 2)
+    assert view[:, :, 0, 0].tolist() == [[3, 4, 5], [3, 4, 5]]
+    stack.push(lambda out: out.fill(6))
+    assert view[0, :, 0, 0].tolist() != [3, 4, 5] # Sicht in den Ring, kein Schnappschuss
+    stack.fill(np.array([True, False]))
+    assert stack.stacked()[:, :, 0, 0].tolist() == [[6, 6, 6], [4, 5, 6]]
+
+def test_render_batch_uses_team_size_of_batch():
+    batch = BatchSoccerSim(2, team_size=2)
+    rasterizer = GridRasterizer(84, 84) # team_size 1: render_batch muss das überschreiben
+    grids = rasterizer.render_batch(batch)
+    sim = SoccerSim(team_size=2)
+    np.testing.assert_array_equal(grids[0], rasterizer.render_sim(sim)[0])
+    # Zwei Spieler je Team: beide Team-Kanäle gleich stark belegt
+    assert np.count_nonzero(grids[0, TEAM1]) == np.count_nonzero(grids[0, TEAM2]) > 0
+
+def test_grid_env_returns_independent_observations():
+    env = SoccerEnv(observation_mode="grid", frame_stack=4)
+    check_env(env, skip_render_check=True)
+    first, _ = env.reset(seed=0)
+    assert env.observation_space.contains(first)
+    np.testing.assert_array_equal(first[:len(CHANNELS)], first[-len(CHANNELS):]) # Nach reset gefüllt
+    kept = first.copy()
+    for _ in range(5):
+        env.step(1)
+    np.testing.assert_array_equal(first, kept)
+    env.close()
@@ -0,0 +1,54 @@
+"""Replays: Aufnahme und Wiedergabe stimmen überein, auch eine nicht abgeschlossene Datei ist lesbar."""
+import numpy as np
+
+from replay import Replay, ReplayRecorder, replay_stats, new_contacts, EVENT_DTYPE, EVENT_CODES
+from simulation import SoccerSim, EVENT_KICK, EVENT_TOUCH, EVENT_GOAL
+from tournament import play_match, replay_path, match_key
+
+def record(path, num_frames, chunk_size=1024, close=True):
+    sim = SoccerSim(seed=0)
+    recorder = ReplayRecorder(path, sim, {"name": "test"}, chunk_size=chunk_size)
+    positions = []
+    for frame in range(num_frames):
+        sim.player1.is_sprinting = frame % 90 < 40 # Wechselnde Eingaben, damit etwas passiert
+        sim.step()
+        positions.append((sim.ball.pos.x, sim.ball.pos.y))
+    if close:
+        recorder.close()
+    return recorder, np.asarray(positions)
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "match.replay")
+    recorder, positions = record(path, 300)
+    replay = Replay(path)
+    assert len(replay) == 300
+    np.testing.assert_allclose(replay.ball_pos, positions, atol=1e-3) # float32 in der Datei
+    assert len(replay.events) == len(recorder.events)
+    assert replay.metadata["name"] == "test" and replay.metadata["seed"] == 0
+    assert replay.kickoff_frames()[0] == 0
+    replay.close()
+
+def test_unfinished_recording_is_readable(tmp_path):
+    path = str(tmp_path / "running.replay")
+    recorder, positions = record(path, 100, chunk_size=32, close=False)
+    replay = Replay(path) # Nur ganze Blöcke sind geschrieben
+    assert len(replay) == 96
+    np.testing.assert_allclose(replay.ball_pos, positions[:96], atol=1e-3)
+    assert len(replay.events) == 0 and replay.metadata == {}
+    replay.close()
+    recorder.close()
+
+def test_stats_count_kicks_like_match_stats(tmp_path):
+    task = ("bot_left", "bot_right", 0)
+    result = play_match(task, duration=60, replay_dir=str(tmp_path)) # Enthält Schüsse über mehrere Frames
+    replay = Replay(replay_path(str(tmp_path), match_key(*task)))
+    stats = replay_stats(replay)
+    assert stats["kicks"] == result["stats"]["kicks_left"] + result["stats"]["kicks_right"]
+    assert (stats["score_left"], stats["score_right"]) == (result["score_left"], result["score_right"])
+    replay.close()
+
+def test_new_contacts():
+    kick, touch, goal = EVENT_CODES[EVENT_KICK], EVENT_CODES[EVENT_TOUCH], EVENT_CODES[EVENT_GOAL]
+    events = np.array([(5, kick, 0), (6, kick, 0), (6, kick, 1), (7, touch, 0), (9, kick, 0), (9, goal, 1)],
+                      dtype=EVENT_DTYPE)
+    assert new_contacts(events).tolist() == [True, False, True, False, True, False]
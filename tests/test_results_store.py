@@ -0,0 +1,30 @@
+"""ResultsStore schreibt gepufferte Runden und Tore; MatchStats zählt Kontakte über mehrere Frames einmal."""
+from results_store import ResultsStore, MatchStats
+from simulation import SoccerSim, EVENT_GOAL, EVENT_KICK
+
+def test_rounds_survive_reopen(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultsStore(path, batch_size=100, flush_interval=3600)
+    stats = MatchStats()
+    stats.goals = [(12.5, 1), (40.0, 2), (55.0, 1)]
+    store.add_round("test", 2, 1, stats=stats, round=1)
+    store.add_round("test", 0, 0, round=2)
+    store.add_round("other", 0, 3, round=1)
+    assert store.connection.execute("SELECT COUNT(*) FROM rounds").fetchone()[0] == 0 # Noch gepuffert
+    store.close()
+
+    store = ResultsStore(path)
+    summary = store.summary("test")
+    assert (summary["rounds"], summary["wins_left"], summary["wins_right"], summary["draws"]) == (2, 1, 0, 1)
+    assert store.summary()["rounds"] == 3
+    assert store.goals_by_phase(30.0, "test") == [(0, 1, 0), (30, 1, 1)]
+    store.close()
+
+def test_match_stats_counts_contacts_once():
+    sim = SoccerSim()
+    stats = MatchStats()
+    for events in ([(EVENT_KICK, 0)], [(EVENT_KICK, 0)], [], [(EVENT_KICK, 0)], [(EVENT_KICK, 1), (EVENT_GOAL, 2)]):
+        stats.record(sim, events, 1.0, 0.5)
+    assert stats.kicks == [2, 1]
+    assert stats.goals == [(1.0, 2)]
+    assert stats.possession == [2.0, 0.0] # Ab dem ersten Kontakt bis zum Tor bei Team 1
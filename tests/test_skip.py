@@ -0,0 +1,103 @@
+"""SoccerSim.skip muss denselben Zustand und dieselbe Checksumme liefern wie einzelne Schritte."""
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from simulation import SoccerSim, PLAYER_RADIUS, FIELD_LEFT, FIELD_RIGHT, FIELD_TOP, FIELD_BOTTOM
+
+DECISION_FRAMES = 30 # Eingaben wechseln nur an Entscheidungspunkten
+TOLERANCE = 1e-6
+NUM_SCENARIOS = 150
+
+def state(sim):
+    values = [sim.ball.pos.x, sim.ball.pos.y, sim.ball.velocity.x, sim.ball.velocity.y]
+    for player in sim.players:
+        values += [player.pos.x, player.pos.y, player.angle]
+    return np.asarray(values)
+
+def set_inputs(sim, sprinting):
+    for player, sprint in zip(sim.players, sprinting):
+        if sprint: player.start_sprint()
+        else: player.stop_sprint()
+
+def advance_skipping(sim, frames):
+    """Rückt frames Frames mit skip vor (step, wo nicht gesprungen wird); gibt die übersprungenen zurück"""
+    done = skipped_frames = 0
+    while done < frames:
+        skipped = round(sim.skip((frames - done) * sim.dt) / sim.dt)
+        if skipped == 0:
+            sim.step()
+            skipped = 1
+        else:
+            skipped_frames += skipped
+        done += skipped
+    return skipped_frames
+
+def scenario(case, seed, swept):
+    """Zufällige Lage: Spieler an Wänden, sich berührend, Sprinter und Dreher, Winkel kurz vor 360"""
+    rng = random.Random(case)
+    sim = SoccerSim(seed=seed, swept=swept, team_size=rng.choice([1, 1, 2]))
+    r = PLAYER_RADIUS
+    for player in sim.players:
+        if rng.random() < 0.3:
+            player.pos = pygame.Vector2(rng.choice([FIELD_LEFT + r, FIELD_RIGHT - r, rng.uniform(50, 750)]),
+                                        rng.choice([FIELD_TOP + r, FIELD_BOTTOM - r]))
+        else:
+            player.pos = pygame.Vector2(rng.uniform(FIELD_LEFT + r, FIELD_RIGHT - r), rng.uniform(FIELD_TOP + r, FIELD_BOTTOM - r))
+        player.angle = rng.choice([rng.uniform(0, 360), 360 - rng.uniform(0, 3), 360 - 1e-9])
+        if rng.random() < 0.4: player.start_sprint()
+    if rng.random() < 0.3:
+        first, second = sim.players[:2]
+        second.pos = first.pos + pygame.Vector2(2 * r - rng.uniform(0, 3), 0).rotate(rng.uniform(0, 360))
+    sim.ball.pos = pygame.Vector2(rng.uniform(100, 700), rng.uniform(FIELD_TOP + 30, FIELD_BOTTOM - 30))
+    sim.ball.velocity = pygame.Vector2(rng.uniform(0, 600), 0).rotate(rng.uniform(0, 360))
+    return sim, rng.randint(30, 200)
+
+@pytest.mark.parametrize("swept", [False, True])
+def test_skip_matches_stepping(swept):
+    rng = random.Random(0)
+    stepped = SoccerSim(seed=0, swept=swept)
+    skipping = SoccerSim(seed=0, swept=swept)
+    for sim in (stepped, skipping):
+        sim.ball.velocity.update(700, 250)
+    skipped_frames = 0
+    for decision in range(60):
+        sprinting = [rng.random() < 0.3 for _ in stepped.players]
+        set_inputs(stepped, sprinting); set_inputs(skipping, sprinting)
+        for _ in range(DECISION_FRAMES):
+            stepped.step()
+        skipped_frames += advance_skipping(skipping, DECISION_FRAMES)
+        assert skipping.frame == stepped.frame
+        np.testing.assert_allclose(state(skipping), state(stepped), rtol=0, atol=TOLERANCE, err_msg=str(decision))
+        assert skipping.checksum == stepped.checksum, decision
+    assert skipped_frames > 0
+
+@pytest.mark.parametrize("swept", [False, True])
+def test_skip_matches_stepping_random_scenarios(swept):
+    skipped_frames = 0
+    for case in range(NUM_SCENARIOS):
+        stepped, frames = scenario(case, 0, swept)
+        skipping, _ = scenario(case, 0, swept)
+        for _ in range(frames):
+            stepped.step()
+        skipped_frames += advance_skipping(skipping, frames)
+        # Mit seed rechnet skip dieselben Schritte wie step - bitgleich
+        assert state(skipping).tolist() == state(stepped).tolist(), case
+        assert skipping.checksum == stepped.checksum, case
+    assert skipped_frames > 0
+
+def test_skip_without_seed_crosses_angle_wrap():
+    """Die geschlossene Form (ohne seed) dreht über 360 hinweg auf denselben Winkel wie step"""
+    stepped, skipping = SoccerSim(), SoccerSim()
+    for sim in (stepped, skipping):
+        for player in sim.players:
+            player.angle = 360 - 1e-9
+    for _ in range(DECISION_FRAMES):
+        stepped.step()
+    assert advance_skipping(skipping, DECISION_FRAMES) > 0
+    for player, reference in zip(skipping.players, stepped.players):
+        difference = (player.angle - reference.angle + 180) % 360 - 180
+        assert abs(difference) < TOLERANCE
+        assert player.pos.distance_to(reference.pos) < TOLERANCE
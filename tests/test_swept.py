@@ -0,0 +1,61 @@
+"""Swept-Modus mit 10-30 Hz muss dieselben Spiele liefern wie feine diskrete Schritte."""
+import functools
+import math
+import random
+
+import pygame
+import pytest
+
+from simulation import (
+    SoccerSim, EVENT_GOAL, EVENT_KICK,
+    PLAYER_RADIUS, FIELD_LEFT, FIELD_RIGHT, FIELD_TOP, FIELD_BOTTOM,
+)
+
+FINE_HZ = 1200
+DURATION = 2.4 # Vielfaches aller Schrittweiten
+NUM_CASES = 30
+TOLERANCE = 2.5 # Pixel; diskret wird jeder Kontakt erst nach dem Eindringen aufgelöst
+
+def shot(case, hz, swept):
+    """Freier Schuss (gerade Fälle) oder Schuss eines Sprinters auf den ruhenden Ball (ungerade).
+
+    Liefert (Tor-Team oder None, Ballposition, Anzahl Kontakte). Der Schütze hört nach
+    dem Schuss auf zu sprinten, der andere Spieler steht in einer Ecke.
+    """
+    rng = random.Random(case)
+    sim = SoccerSim(dt=1.0 / hz, seed=0, swept=swept)
+    ball, kicker, other = sim.ball, sim.player1, sim.player2
+    kicker.pos = pygame.Vector2(FIELD_LEFT + PLAYER_RADIUS, FIELD_TOP + PLAYER_RADIUS)
+    other.pos = pygame.Vector2(FIELD_RIGHT - PLAYER_RADIUS, FIELD_BOTTOM - PLAYER_RADIUS)
+    ball.pos = pygame.Vector2(rng.uniform(150, 650), rng.uniform(FIELD_TOP + 60, FIELD_BOTTOM - 60))
+    if case % 2:
+        kicker.pos = ball.pos + pygame.Vector2(rng.uniform(60, 150), 0).rotate(rng.uniform(0, 360))
+        kicker.clamp_to_field()
+        to_ball = ball.pos - kicker.pos
+        kicker.angle = math.degrees(math.atan2(to_ball.y, to_ball.x)) + rng.uniform(-15, 15)
+        kicker.start_sprint()
+    else:
+        ball.velocity = pygame.Vector2(rng.uniform(200, 900), 0).rotate(rng.uniform(0, 360))
+    contacts = 0
+    for _ in range(round(DURATION * hz)):
+        for event, data in sim.step():
+            if event == EVENT_GOAL:
+                return data, ball.pos, contacts
+            contacts += 1
+            if event == EVENT_KICK:
+                kicker.stop_sprint()
+    return None, ball.pos, contacts
+
+@functools.lru_cache(maxsize=None)
+def fine_shot(case):
+    return shot(case, FINE_HZ, swept=False)
+
+@pytest.mark.parametrize("hz", [10, 15, 30])
+def test_swept_matches_fine_stepping(hz):
+    for case in range(NUM_CASES):
+        goal, ball_pos, contacts = shot(case, hz, swept=True)
+        fine_goal, fine_pos, fine_contacts = fine_shot(case)
+        assert goal == fine_goal, case
+        # Mehrfache sanfte Stöße hängen diskret von der Schrittweite ab - nur einzelne Kontakte vergleichen
+        if goal is None and contacts <= 1 and fine_contacts <= 1:
+            assert ball_pos.distance_to(fine_pos) < TOLERANCE, (case, ball_pos, fine_pos)
@@ -0,0 +1,28 @@
+"""Telemetry schreibt nur Stichproben und liest sich in beiden Formaten gleich zurück."""
+import numpy as np
+import pytest
+
+from telemetry import Telemetry, read_telemetry
+
+FIELDS = ("time", "score")
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_round_trip(tmp_path, binary):
+    path = str(tmp_path / ("telemetry.bin" if binary else "telemetry.jsonl"))
+    telemetry = Telemetry(path, FIELDS, sample_every=3, capacity=16, batch_size=4, binary=binary)
+    for frame in range(1, 31):
+        telemetry.record(frame, (frame / 60, frame // 10))
+    telemetry.close()
+    rows = read_telemetry(path)
+    assert telemetry.dropped == 0 and telemetry.written == 10
+    np.testing.assert_array_equal(rows["frame"], np.arange(3, 31, 3))
+    np.testing.assert_allclose(rows["time"], np.arange(3, 31, 3) / 60)
+    np.testing.assert_array_equal(rows["score"], np.arange(3, 31, 3) // 10)
+
+def test_full_buffer_drops_instead_of_blocking(tmp_path):
+    telemetry = Telemetry(str(tmp_path / "telemetry.jsonl"), FIELDS, sample_every=1, capacity=4,
+                          batch_size=1000, flush_interval=3600)
+    for frame in range(10):
+        telemetry.record(frame, (0.0, 0))
+    telemetry.close()
+    assert (telemetry.written, telemetry.dropped) == (4, 6)
@@ -0,0 +1,9 @@
+"""Turnier-Spiele: derselbe Seed wiederholt ein Spiel, verschiedene Seeds ergeben verschiedene Spiele."""
+from tournament import play_match
+
+DURATION = 10
+
+def test_seed_changes_match():
+    checksums = [play_match(("bot_left", "bot_right", seed), duration=DURATION)["checksum"] for seed in range(4)]
+    assert len(set(checksums)) == len(checksums)
+    assert play_match(("bot_left", "bot_right", 2), duration=DURATION)["checksum"] == checksums[2]
@@ -0,0 +1,365 @@
+"""Round-Robin Turnier für Bots und trainierte Agenten mit Elo-Wertung.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python tournament.py bot_left bot_right "bot_left:BOT_ATTACK_DURATION=5" ppo:ai/models/ppo_soccer_agent_final.zip
+        [--games 4] [--duration 60] [--workers 8] [--results tournament_results.jsonl] [--replays replays]
+        [--physics-hz 15] [--decision-hz 10]
+
+Controller werden als Text angegeben:
+    bot_left / bot_right              Bot-Modul aus dem Hauptverzeichnis
+    bot_left:NAME=WERT,NAME=WERT      Variante mit überschriebenen Modul-Konstanten
+    ppo:PFAD                          stable-baselines3 PPO-Checkpoint (Beobachtung wie SoccerEnv)
+
+Jede Paarung wird --games mal auf beiden Seiten gespielt, headless und parallel in
+einem Prozess-Pool. Der Seed jedes Spiels dreht die Spieler bei jedem Anstoß zufällig
+(KICKOFF_JITTER), sonst wären die Wiederholungen deterministischer Controller identisch. Jedes fertige Spiel wird sofort als Zeile an --results angehängt;
+ein erneuter Aufruf mit derselben Datei spielt nur die noch fehlenden Spiele.
+Die Wertung ist ein Bradley-Terry-Fit auf Elo-Skala (Unentschieden = halber Sieg)
+mit Bootstrap-Konfidenzintervallen.
+
+--physics-hz unter FPS rechnet die Physik mit dt = 1/Hz im Swept-Modus der Simulation
+(kontinuierliche Kollisionen, siehe SoccerSim); die Bots entscheiden dann auch nur so oft.
+--decision-hz lässt die Controller nur so oft entscheiden; dazwischen halten sie ihre
+Eingaben und ruhige Phasen werden mit SoccerSim.skip übersprungen.
+Solche Spiele haben einen eigenen Schlüssel und mischen sich nicht mit Spielen bei FPS.
+"""
+import argparse
+import ast
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+from multiprocessing import Pool
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from replay import ReplayRecorder
+from results_store import ResultsStore, MatchStats
+from simulation import (
+    SoccerSim, EVENT_GOAL, FPS,
+    SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_RADIUS, BALL_RADIUS, GOAL_WIDTH, TRIBUNE_HEIGHT,
+)
+
+MATCH_DURATION = 60  # Sekunden Spielzeit wie GAME_DURATION im Spiel
+KICKOFF_JITTER = 20  # Grad: zufällige Drehung der Spieler beim Anstoß (aus dem Seed des Spiels)
+ELO_BASE = 1500
+ELO_SCALE = 400 / math.log(10)
+
+# Heimatseite der Controller (1 = links, 2 = rechts); auf der anderen Seite sehen sie das Feld gespiegelt
+BOT_NATIVE_TEAM = {"bot_left": 1, "bot_right": 2}
+PPO_NATIVE_TEAM = 2  # SoccerEnv trainiert den Agenten als player2
+
+# --- Gespiegelte Sicht ---
+class MirroredView:
+    """Nur-Lese-Sicht auf Spieler oder Ball, an der Mittellinie gespiegelt"""
+    __slots__ = ("entity", "pos", "velocity", "angle")
+
+    def __init__(self, entity):
+        self.entity = entity
+        self.pos = pygame.Vector2(SCREEN_WIDTH - entity.pos.x, entity.pos.y)
+        self.velocity = pygame.Vector2(-entity.velocity.x, entity.velocity.y)
+        self.angle = (180 - entity.angle) % 360 if hasattr(entity, "angle") else 0
+
+    def __getattr__(self, name): # radius, sprint_speed, is_sprinting, ...
+        return getattr(self.entity, name)
+
+def view(entity, mirrored):
+    return MirroredView(entity) if mirrored else entity
+
+# --- Controller ---
+def parse_overrides(text):
+    overrides = {}
+    for item in filter(None, text.split(",")):
+        name, _, value = item.partition("=")
+        try:
+            overrides[name.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            overrides[name.strip()] = value.strip()
+    return overrides
+
+class BotController:
+    """Bot-Modul mit eigenem Modul-Zustand (jede Instanz lädt das Modul neu)"""
+
+    def __init__(self, spec, name, overrides):
+        if name not in BOT_NATIVE_TEAM:
+            raise ValueError(f"Unbekannter Bot '{name}' in '{spec}'")
+        module_spec = importlib.util.spec_from_file_location(f"{name}_{id(self)}", os.path.join(ROOT_DIR, f"{name}.py"))
+        self.module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(self.module)
+        for key, value in overrides.items():
+            if not hasattr(self.module, key):
+                raise ValueError(f"{name} hat keine Konstante {key}")
+            setattr(self.module, key, value)
+        self.native_team = BOT_NATIVE_TEAM[name]
+
+    def reset(self):
+        self.module.reset_bot_state()
+
+    def control(self, player, opponent, ball, team, dt):
+        mirrored = team != self.native_team
+        # Ziel ist immer das gegnerische Tor aus Sicht der Heimatseite
+        target_goal_x = SCREEN_WIDTH - GOAL_WIDTH if self.native_team == 1 else 0
+        should_sprint = self.module.get_bot_decision(
+            view(player, mirrored), view(ball, mirrored), target_goal_x,
+            SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_RADIUS, BALL_RADIUS, TRIBUNE_HEIGHT, dt)
+        if should_sprint and not player.is_sprinting: player.start_sprint()
+        elif not should_sprint and player.is_sprinting: player.stop_sprint()
+
+_ppo_models = {} # Pro Prozess nur einmal laden
+
+class PPOController:
+    """Trainierter Agent: Aktionen wie in SoccerEnv.step"""
+
+    def __init__(self, spec, path):
+        sys.path.insert(0, os.path.join(ROOT_DIR, "ai"))
+        from stable_baselines3 import PPO
+        import rl_env
+        self.rl_env = rl_env
+        if path not in _ppo_models:
+            if not os.path.exists(path):
+                raise ValueError(f"Checkpoint {path} nicht gefunden")
+            _ppo_models[path] = PPO.load(path, device="cpu")
+        self.model = _ppo_models[path]
+        self.native_team = PPO_NATIVE_TEAM
+
+    def reset(self):
+        pass
+
+    def control(self, player, opponent, ball, team, dt):
+        env = self.rl_env
+        mirrored = team != self.native_team
+        obs = env.build_observation(view(player, mirrored), view(opponent, mirrored), view(ball, mirrored))
+        action, _ = self.model.predict(obs, deterministic=True)
+        action = int(action)
+        if action == env.ACTION_SPRINT:
+            if not player.is_sprinting: player.start_sprint()
+            return
+        if player.is_sprinting: player.stop_sprint()
+        if action in (env.ACTION_ROTATE_LEFT, env.ACTION_ROTATE_RIGHT):
+            turn = player.rotation_speed * dt * (-1 if action == env.ACTION_ROTATE_LEFT else 1)
+            player.angle = (player.angle - turn if mirrored else player.angle + turn) % 360
+
+def make_controller(spec):
+    kind, _, rest = spec.partition(":")
+    if kind == "ppo":
+        return PPOController(spec, rest)
+    return BotController(spec, kind, parse_overrides(rest))
+
+# --- Spiele ---
+def match_key(left, right, seed, physics_hz=FPS, decision_hz=None):
+    key = f"{left}|{right}|{seed}"
+    if physics_hz != FPS:
+        key += f"|{physics_hz:g}hz"
+    if decision_hz is not None:
+        key += f"|{decision_hz:g}dec"
+    return key
+
+def schedule(specs, games, base_seed=0):
+    """Alle Paarungen auf beiden Seiten, jeweils games Spiele: Liste von (left, right, seed)"""
+    tasks = []
+    for i, a in enumerate(specs):
+        for b in specs[i + 1:]:
+            for seed in range(base_seed, base_seed + games): # Beide Seiten mit denselben Seeds
+                tasks.append((a, b, seed))
+                tasks.append((b, a, seed))
+    return tasks
+
+def jitter_kickoff(sim, rng, jitter=KICKOFF_JITTER):
+    """Dreht die Spieler nach einem Anstoß zufällig aus rng"""
+    for player in sim.players:
+        player.angle = (player.angle + rng.uniform(-jitter, jitter)) % 360
+
+def replay_path(replay_dir, key):
+    return os.path.join(replay_dir, key.replace("|", "__").replace(":", "_").replace("/", "_") + ".replay")
+
+def play_match(task, duration=MATCH_DURATION, replay_dir=None, physics_hz=FPS, decision_hz=None):
+    """Spielt ein headless Spiel und gibt das Ergebnis als dict zurück
+
+    decision_hz: Controller entscheiden nur so oft (Standard: jeden Physik-Schritt).
+    Dazwischen springt sim.skip über ruhige Frames - in O(1) nur ohne seed, daher laufen
+    solche Spiele ohne seed und ohne Checksumme (der Anstoß-Zufall kommt aus rng).
+    """
+    left_spec, right_spec, seed = task
+    key = match_key(left_spec, right_spec, seed, physics_hz, decision_hz)
+    left = make_controller(left_spec); right = make_controller(right_spec)
+    left.reset(); right.reset()
+    # Unter FPS braucht die grobe Schrittweite die kontinuierlichen Kollisionen
+    decide_every = 1 if decision_hz is None else max(1, round(physics_hz / decision_hz))
+    # Mit Recorder wird nie gesprungen, dann darf die Checksumme mitlaufen
+    seeded = decide_every == 1 or replay_dir is not None
+    sim = SoccerSim(dt=1.0 / physics_hz, seed=seed if seeded else None, swept=physics_hz < FPS)
+    rng = random.Random(seed)
+    jitter_kickoff(sim, rng)
+    stats = MatchStats()
+    recorder = None
+    if replay_dir is not None:
+        recorder = ReplayRecorder(replay_path(replay_dir, key), sim,
+                                  {"left": left_spec, "right": right_spec})
+    while sim.time < duration:
+        left.control(sim.player1, sim.player2, sim.ball, 1, sim.dt * decide_every)
+        right.control(sim.player2, sim.player1, sim.ball, 2, sim.dt * decide_every)
+        frames = 0
+        while frames < decide_every and sim.time < duration:
+            # Bis zur nächsten Entscheidung halten die Controller ihre Eingaben
+            skipped = sim.skip(min((decide_every - frames) * sim.dt, duration - sim.time)) if decide_every > 1 else 0.0
+            if skipped:
+                frames += round(skipped / sim.dt)
+                stats.record(sim, (), sim.time, skipped)
+                continue
+            events = sim.step()
+            frames += 1
+            stats.record(sim, events, sim.time, sim.dt)
+            if any(event == EVENT_GOAL for event, _ in events): # Anstoß sofort; die Torpause des Spiels hält die Uhr ohnehin an
+                sim.stop_all()
+                sim.reset_positions()
+                jitter_kickoff(sim, rng)
+                break
+    if recorder is not None:
+        recorder.close()
+    return {"key": key, "left": left_spec, "right": right_spec,
+            "seed": seed, "score_left": sim.score1, "score_right": sim.score2, "duration": duration,
+            "goals": stats.goals, "stats": stats.columns(), "checksum": f"{sim.checksum:016x}" if seeded else None}
+
+def _play_quiet(task_and_options):
+    task, options = task_and_options
+    return play_match(task, **options)
+
+def _silence_worker():
+    sys.stdout = open(os.devnull, "w") # Bots melden jeden Moduswechsel per print
+
+def load_results(path):
+    results = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError: # Abgebrochene letzte Zeile
+                    continue
+                results[result["key"]] = result
+    return results
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def store_result(store, result):
+    stats = MatchStats()
+    stats.goals = [tuple(goal) for goal in result["goals"]]
+    store.add_round("tournament", result["score_left"], result["score_right"], stats=stats,
+                    left_name=result["left"], right_name=result["right"], duration=result["duration"],
+                    **result["stats"])
+
+def run_tournament(specs, games, results_path, workers=None, duration=MATCH_DURATION, base_seed=0, store=None,
+                   replay_dir=None, physics_hz=FPS, decision_hz=None):
+    for spec in specs: # Fehler in der Controller-Angabe früh melden, nicht erst im Pool
+        make_controller(spec)
+    if replay_dir is not None:
+        os.makedirs(replay_dir, exist_ok=True)
+    results = load_results(results_path)
+    pending = [task for task in schedule(specs, games, base_seed) if match_key(*task, physics_hz, decision_hz) not in results]
+    print(f"{len(results)} Spiele vorhanden, {len(pending)} offen")
+    if pending:
+        with open(results_path, "a", encoding="utf-8") as out, \
+             Pool(workers or os.cpu_count(), initializer=_silence_worker) as pool:
+            if out.tell() > 0 and not _ends_with_newline(results_path):
+                out.write("\n") # Abgebrochene letzte Zeile abschließen
+            options = {"duration": duration, "replay_dir": replay_dir, "physics_hz": physics_hz, "decision_hz": decision_hz}
+            for done, result in enumerate(pool.imap_unordered(_play_quiet, [(task, options) for task in pending]), 1):
+                out.write(json.dumps(result) + "\n")
+                out.flush() # Nach jedem Spiel sichern, damit ein Abbruch nichts verliert
+                results[result["key"]] = result
+                if store is not None:
+                    store_result(store, result)
+                print(f"[{done}/{len(pending)}] {result['left']} {result['score_left']}:{result['score_right']} {result['right']}")
+    wanted = {match_key(*task, physics_hz, decision_hz) for task in schedule(specs, games, base_seed)}
+    return [result for key, result in results.items() if key in wanted]
+
+# --- Wertung ---
+def fit_elo(specs, results, iterations=200):
+    """Bradley-Terry per MM-Algorithmus; jeder Spieler bekommt ein virtuelles Remis gegen ELO_BASE"""
+    index = {spec: i for i, spec in enumerate(specs)}
+    n = len(specs)
+    wins = [0.5] * n # Virtuelles Remis als Prior, damit Spieler ohne Sieg endlich bleiben
+    pairs = {}
+    for result in results:
+        a, b = index[result["left"]], index[result["right"]]
+        score_a = 1.0 if result["score_left"] > result["score_right"] else 0.5 if result["score_left"] == result["score_right"] else 0.0
+        wins[a] += score_a; wins[b] += 1 - score_a
+        key = (min(a, b), max(a, b))
+        pairs[key] = pairs.get(key, 0) + 1
+    gamma = [1.0] * n
+    for _ in range(iterations):
+        for i in range(n):
+            denominator = 1 / (gamma[i] + 1.0) # Virtueller Gegner mit gamma = 1
+            for (a, b), count in pairs.items():
+                if a == i: denominator += count / (gamma[i] + gamma[b])
+                elif b == i: denominator += count / (gamma[i] + gamma[a])
+            gamma[i] = wins[i] / denominator
+    return [ELO_BASE + ELO_SCALE * math.log(g) for g in gamma]
+
+def rate(specs, results, bootstrap=200, confidence=0.95, seed=0):
+    """Elo je Controller mit Bootstrap-Intervall: [(spec, elo, low, high)]"""
+    elo = fit_elo(specs, results)
+    rng = random.Random(seed)
+    samples = [fit_elo(specs, [rng.choice(results) for _ in results]) for _ in range(bootstrap)] if results else []
+    table = []
+    for i, spec in enumerate(specs):
+        values = sorted(sample[i] for sample in samples) or [elo[i]]
+        low = values[int((1 - confidence) / 2 * (len(values) - 1))]
+        high = values[int((1 + confidence) / 2 * (len(values) - 1))]
+        table.append((spec, elo[i], low, high))
+    return sorted(table, key=lambda row: -row[1])
+
+def print_table(specs, results, bootstrap):
+    record = {spec: [0, 0, 0, 0, 0] for spec in specs} # S, U, N, Tore, Gegentore
+    for result in results:
+        for spec, own, other in ((result["left"], result["score_left"], result["score_right"]),
+                                 (result["right"], result["score_right"], result["score_left"])):
+            row = record[spec]
+            row[0 if own > other else 1 if own == other else 2] += 1
+            row[3] += own; row[4] += other
+    print(f"\n{'Controller':<40} {'Elo':>6} {'95%-Intervall':>15} {'S':>4} {'U':>4} {'N':>4} {'Tore':>9}")
+    for spec, elo, low, high in rate(specs, results, bootstrap):
+        w, d, l, gf, ga = record[spec]
+        print(f"{spec:<40} {elo:6.0f} {f'{low:.0f}..{high:.0f}':>15} {w:4} {d:4} {l:4} {f'{gf}:{ga}':>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("controllers", nargs="+")
+    parser.add_argument("--games", type=int, default=4, help="Spiele pro Paarung und Seite")
+    parser.add_argument("--duration", type=float, default=MATCH_DURATION, help="Spielzeit in Sekunden")
+    parser.add_argument("--workers", type=int, default=None, help="Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--results", default="tournament_results.jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bootstrap", type=int, default=200)
+    parser.add_argument("--store", help="Neu gespielte Spiele zusätzlich in diesen Ergebnis-Speicher (SQLite) schreiben")
+    parser.add_argument("--replays", help="Verzeichnis für Replays der neu gespielten Spiele (siehe replay.py)")
+    parser.add_argument("--physics-hz", type=float, default=FPS,
+                        help=f"Physik-Schritte pro Sekunde (unter {FPS}: Swept-Modus)")
+    parser.add_argument("--decision-hz", type=float, default=None,
+                        help="Entscheidungen der Controller pro Sekunde (Standard: jeden Physik-Schritt)")
+    args = parser.parse_args()
+    if len(set(args.controllers)) != len(args.controllers):
+        parser.error("Controller doppelt angegeben")
+
+    store = ResultsStore(args.store) if args.store else None
+    try:
+        results = run_tournament(args.controllers, args.games, args.results, args.workers, args.duration, args.seed, store,
+                                 args.replays, args.physics_hz, args.decision_hz)
+    finally:
+        if store is not None:
+            store.close()
+    print_table(args.controllers, results, args.bootstrap)
+
+if __name__ == "__main__":
+    main()
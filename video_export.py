@@ -0,0 +1,174 @@
+"""Video-Export: schreibt gerenderte Frames oder ganze Replays im Hintergrund mit cv2.VideoWriter.
+
+Aufruf (aus dem Hauptverzeichnis):
+    python video_export.py replays/bot_left__bot_right__0.replay [weitere.replay ...]
+        [--output-dir videos] [--step 1] [--fourcc mp4v]
+
+Ein Replay wird ohne Fenster und ohne Warten neu gezeichnet (wie im Replay-Viewer) und
+als <name>.mp4 geschrieben; --step 2 nimmt nur jeden zweiten Frame (halbe Bildrate).
+
+Im Spiel übernimmt VideoExporter die Frames: Die Hauptschleife kopiert nur die Pixel der
+Surface in einen freien Puffer eines festen Pools und stellt ihn in eine Queue; Farbumrechnung
+und Kodierung laufen im Worker-Thread (cv2 gibt dabei den GIL frei). Ist kein Puffer frei,
+wird der Frame mit drop_frames=True verworfen statt die Schleife aufzuhalten, sonst wird gewartet.
+Mit repeat kodiert der Worker einen Frame mehrfach, ohne weitere Puffer zu belegen - so hält
+das Spiel die feste Bildrate des Videos, auch wenn es selbst langsamer läuft.
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+import visuals
+from replay import Replay
+from replay_viewer import ReplayView, NUM_SPECTATORS, draw_scene
+from sprites import SimSprites
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT, TRIBUNE_HEIGHT
+
+DEFAULT_FOURCC = "mp4v"
+QUEUE_FRAMES = 32 # Puffer im Pool: so viele Frames darf der Worker zurückliegen
+
+class VideoExporter:
+    def __init__(self, path, size, fps, fourcc=DEFAULT_FOURCC, queue_frames=QUEUE_FRAMES, drop_frames=True):
+        self.path = path
+        self.size = tuple(size)
+        self.drop_frames = drop_frames
+        width, height = self.size
+        self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+        if not self.writer.isOpened():
+            raise RuntimeError(f"VideoWriter für {path} ({fourcc}) lässt sich nicht öffnen")
+        # Jeder Puffer fasst einen Frame mit 4 Bytes pro Pixel; RGB-Arrays nutzen nur den Anfang
+        self.free = queue.Queue()
+        for _ in range(queue_frames):
+            self.free.put(np.empty(width * height * 4, dtype=np.uint8))
+        self.pending = queue.Queue()
+        self.bgr = np.empty((height, width, 3), dtype=np.uint8)
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="video-export", daemon=True)
+        self.thread.start()
+
+    def write(self, frame, repeat=1):
+        """Frame übernehmen: pygame.Surface oder RGB-Array (H, W, 3), repeat-mal kodiert. False, wenn verworfen"""
+        if self.error is not None:
+            raise self.error
+        try:
+            buffer = self.free.get(block=not self.drop_frames)
+        except queue.Empty:
+            self.frames_dropped += 1
+            return False
+        if isinstance(frame, pygame.Surface):
+            item = self._copy_surface(frame, buffer)
+        else:
+            item = self._copy_array(frame, buffer)
+        self.pending.put((item, repeat))
+        return True
+
+    def _copy_surface(self, surface, buffer):
+        if surface.get_size() != self.size:
+            raise ValueError(f"Surface {surface.get_size()} passt nicht zur Videogröße {self.size}")
+        width, height = self.size
+        code = surface_conversion(surface)
+        if code is None: # Kein 32-Bit-Format mit bekannter Byte-Reihenfolge: über RGB
+            return self._copy_array(pygame.surfarray.pixels3d(surface).transpose(1, 0, 2), buffer)
+        # pixels2d ist (W, H) über den Zeilen der Surface; .T kopiert Zeile für Zeile
+        pixels = pygame.surfarray.pixels2d(surface)
+        np.copyto(buffer.view(np.uint32).reshape(height, width), pixels.T, casting="unsafe")
+        del pixels # Surface wieder freigeben
+        return buffer, (height, width, 4), code
+
+    def _copy_array(self, frame, buffer):
+        width, height = self.size
+        if frame.shape != (height, width, 3):
+            raise ValueError(f"Frame {frame.shape} passt nicht zur Videogröße {self.size}")
+        np.copyto(buffer[:height * width * 3].reshape(height, width, 3), frame)
+        return buffer, (height, width, 3), cv2.COLOR_RGB2BGR
+
+    def _run(self):
+        try:
+            while True:
+                item = self.pending.get()
+                if item is None:
+                    break
+                (buffer, shape, code), repeat = item
+                frame = buffer[:shape[0] * shape[1] * shape[2]].reshape(shape)
+                cv2.cvtColor(frame, code, dst=self.bgr)
+                self.free.put(buffer)
+                for _ in range(repeat):
+                    self.writer.write(self.bgr)
+                self.frames_written += repeat
+        except Exception as error:
+            self.error = error
+            # Blockierende write()-Aufrufe nicht hängen lassen
+            self.free.put(np.empty(self.size[0] * self.size[1] * 4, dtype=np.uint8))
+        finally:
+            self.writer.release()
+
+    def close(self, wait=True):
+        """Restliche Frames kodieren und die Datei schließen (wait=False: im Hintergrund)"""
+        self.pending.put(None)
+        if wait:
+            self.thread.join()
+            if self.error is not None:
+                raise self.error
+
+def surface_conversion(surface):
+    """cv2-Farbumrechnung für die Bytes einer 32-Bit-Surface (None: nicht direkt kopierbar)"""
+    if surface.get_bytesize() != 4 or sys.byteorder != "little":
+        return None
+    red, green, blue = surface.get_shifts()[:3]
+    if (red, green, blue) == (16, 8, 0):
+        return cv2.COLOR_BGRA2BGR
+    if (red, green, blue) == (0, 8, 16):
+        return cv2.COLOR_RGBA2BGR
+    return None
+
+def export_replay(replay_path, video_path, step=1, fourcc=DEFAULT_FOURCC, queue_frames=QUEUE_FRAMES):
+    """Replay Frame für Frame neu zeichnen und kodieren; liefert die Anzahl geschriebener Frames"""
+    pygame.font.init()
+    main_font = pygame.font.Font(None, 50); menu_font = pygame.font.Font(None, 60)
+    replay = Replay(replay_path)
+    try:
+        view = ReplayView(replay)
+        visuals.generate_spectators(SCREEN_WIDTH, SCREEN_HEIGHT, TRIBUNE_HEIGHT, NUM_SPECTATORS)
+        sprites = SimSprites(view.sim)
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        exporter = VideoExporter(video_path, (SCREEN_WIDTH, SCREEN_HEIGHT), 1.0 / (replay.dt * step),
+                                 fourcc=fourcc, queue_frames=queue_frames, drop_frames=False)
+        try:
+            for index in range(0, len(replay), step):
+                view.show(index)
+                draw_scene(screen, view, sprites, index, main_font, menu_font)
+                exporter.write(screen)
+        finally:
+            exporter.close()
+    finally:
+        replay.close()
+    return exporter.frames_written
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Replay-Dateien")
+    parser.add_argument("--output-dir", default="videos")
+    parser.add_argument("--step", type=int, default=1, help="Nur jeden n-ten Frame exportieren")
+    parser.add_argument("--fourcc", default=DEFAULT_FOURCC)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for path in args.paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        video_path = os.path.join(args.output_dir, name + ".mp4")
+        start = time.perf_counter()
+        frames = export_replay(path, video_path, step=args.step, fourcc=args.fourcc)
+        elapsed = time.perf_counter() - start
+        print(f"{video_path}: {frames} Frames in {elapsed:.1f} s ({frames / max(elapsed, 1e-9):.0f} fps)")
+
+if __name__ == "__main__":
+    main()
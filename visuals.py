@@ -1,7 +1,10 @@
 import pygame
+import itertools
 import math
 import random
 
+import numpy as np
+
 # --- Visuelle Konstanten ---
 FIELD_COLOR = (0, 0, 0)  # Schwarz statt Grün
 LINE_COLOR = (255, 255, 255)
@@ -10,7 +13,7 @@ BALL_COLOR = (255, 255, 255)
 TRIBUNE_COLOR = (60, 60, 60)
 
 # --- Effekt Konstanten ---
-MAX_PARTICLES = 300
+MAX_PARTICLES = 3000
 BALL_TRAIL_LENGTH = 15
 BALL_TRAIL_MIN_SPEED = 10
 
@@ -22,59 +25,165 @@ SPECTATOR_COLORS = [
     (150, 150, 255), (255, 255, 150)
 ]
 
-# --- Partikel Klasse ---
-class Particle:
-    def __init__(self, pos, vel, color, lifetime, radius_range=(1, 3), gravity=0):
-        self.pos = pygame.Vector2(pos)
-        self.vel = pygame.Vector2(vel)
-        self.color = color
-        self.lifetime = lifetime
-        self.start_lifetime = lifetime
-        self.radius = random.uniform(radius_range[0], radius_range[1])
-        self.gravity = gravity
+# --- Partikel ---
+# Alle Partikel liegen in NumPy-Arrays (ein Eintrag pro Partikel, lebende vorne).
+# update() rechnet Gravitation, Bewegung, Lebensdauer und Schrumpfen vektorisiert;
+# gezeichnet wird per Surface.blits aus einem Atlas vorgerenderter Kreise, Schlüssel
+# ist (quantisierte Farbe, Radius, Alpha-Stufe). Pro Frame entstehen keine Surfaces.
+PARTICLE_ALPHA_LEVELS = 16
+PARTICLE_COLOR_STEP = 32        # Farbkanäle auf Vielfache davon runden (Atlas bleibt klein)
+PARTICLE_ATLAS_LIMIT = 4096     # Danach wird der Atlas geleert und neu aufgebaut
+
+def quantize_color(color):
+    return tuple(min(255, (channel + PARTICLE_COLOR_STEP // 2) // PARTICLE_COLOR_STEP * PARTICLE_COLOR_STEP)
+                 for channel in color[:3])
+
+class ParticlePool:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.start_lifetime = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.color_key = np.zeros(capacity, dtype=np.int64) # 0xRRGGBB, quantisiert
+        self.atlas = {}
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, pos, velocities, colors, lifetimes, radii, gravity):
+        """Hängt len(velocities) Partikel an derselben Startposition an"""
+        count = len(velocities)
+        start = self.count; end = start + count
+        self.pos[start:end] = (pos[0], pos[1])
+        self.vel[start:end] = velocities
+        self.gravity[start:end] = gravity
+        self.lifetime[start:end] = lifetimes
+        self.start_lifetime[start:end] = lifetimes
+        self.radius[start:end] = radii
+        self.color_key[start:end] = [(r << 16) | (g << 8) | b for r, g, b in map(quantize_color, colors)]
+        self.count = end
 
     def update(self, dt):
-        self.vel.y += self.gravity * dt
-        self.pos += self.vel * dt
-        self.lifetime -= dt
-        if self.start_lifetime > 0:
-            self.radius = max(0, self.radius * (self.lifetime / self.start_lifetime))
+        """Bewegt alle Partikel und entfernt abgelaufene (Reihenfolge der übrigen bleibt)"""
+        n = self.count
+        if not n:
+            return
+        vel = self.vel[:n]; lifetime = self.lifetime[:n]; start_lifetime = self.start_lifetime[:n]
+        vel[:, 1] += self.gravity[:n] * dt
+        self.pos[:n] += vel * dt
+        lifetime -= dt
+        shrinking = start_lifetime > 0
+        self.radius[:n][shrinking] = np.maximum(0, self.radius[:n][shrinking] * (lifetime[shrinking] / start_lifetime[shrinking]))
+        alive = lifetime > 0
+        if not alive.all():
+            kept = int(np.count_nonzero(alive))
+            for array in (self.pos, self.vel, self.gravity, self.lifetime, self.start_lifetime, self.radius, self.color_key):
+                array[:kept] = array[:n][alive]
+            self.count = kept
 
     def draw(self, surface):
-        if self.lifetime > 0 and self.radius >= 1:
-            alpha = max(0, min(255, int(255 * (self.lifetime / self.start_lifetime))))
-            try:
-                temp_surf = pygame.Surface((int(self.radius*2), int(self.radius*2)), pygame.SRCALPHA)
-                draw_color = (*self.color[:3], alpha)
-                pygame.draw.circle(temp_surf, draw_color, (int(self.radius), int(self.radius)), int(self.radius))
-                surface.blit(temp_surf, self.pos - pygame.Vector2(self.radius, self.radius))
-            except (ValueError, TypeError):
-                 pygame.draw.circle(surface, self.color, self.pos, int(self.radius))
-
-# Globale Partikel-Liste
-particles = []
-
-def emit_particles(count, pos, base_color, vel_range=(-50, 50), life_range=(0.2, 0.6), radius_range=(1, 3), gravity=0):
+        n = self.count
+        radius = self.radius[:n]
+        visible = np.nonzero(radius >= 1)[0][::-1] # Neueste zuerst, wie bisher
+        if not len(visible):
+            return None
+        radii = radius[visible].astype(np.int64)
+        alpha = np.clip(self.lifetime[visible] / self.start_lifetime[visible], 0, 1)
+        levels = np.minimum((alpha * PARTICLE_ALPHA_LEVELS).astype(np.int64), PARTICLE_ALPHA_LEVELS - 1)
+        keys = (self.color_key[visible] << 16) | (radii << 8) | levels
+        corners = (self.pos[visible] - radius[visible, None]).astype(np.int64)
+        atlas = self.atlas
+        if len(atlas) > PARTICLE_ATLAS_LIMIT:
+            atlas.clear()
+        keys = keys.tolist()
+        for key in set(keys).difference(atlas):
+            atlas[key] = self._render(key)
+        images = map(atlas.__getitem__, keys)
+        surface.blits(zip(images, zip(corners[:, 0].tolist(), corners[:, 1].tolist())), doreturn=False)
+        # Überdeckter Bereich als ein Rechteck (für Dirty-Rect-Rendering)
+        left, top = corners.min(axis=0); right, bottom = (corners + 2 * radii[:, None]).max(axis=0)
+        return pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))
+
+    @staticmethod
+    def _render(key):
+        color_key = key >> 16; radius = (key >> 8) & 0xFF; level = key & 0xFF
+        alpha = min(255, int(255 * (level + 0.5) / PARTICLE_ALPHA_LEVELS))
+        image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        color = ((color_key >> 16) & 0xFF, (color_key >> 8) & 0xFF, color_key & 0xFF, alpha)
+        pygame.draw.circle(image, color, (radius, radius), radius)
+        return image
+
+# Globaler Partikel-Pool
+particles = ParticlePool(MAX_PARTICLES)
+
+# --- Qualität (setzt quality.QualityGovernor) ---
+# Anteil der ausgegebenen Partikel, Punkte der Ballspur, nur jeder n-te Zuschauer
+particle_fraction = 1.0
+particle_carry = 0.0 # Gebrochener Rest, damit auch einzelne Partikel anteilig erscheinen
+trail_points = BALL_TRAIL_LENGTH
+spectator_stride = 1
+
+def set_quality(fraction=1.0, points=BALL_TRAIL_LENGTH, stride=1):
+    global particle_fraction, particle_carry, trail_points, spectator_stride
+    particle_fraction = fraction; particle_carry = 0.0
+    trail_points = points
+    spectator_stride = stride
+
+def emit_particles(count, pos, base_color, vel_range=(-50, 50), life_range=(0.2, 0.6), radius_range=(1, 3), gravity=0, rng=None):
+    """Erzeugt count Partikel; rng (z.B. random.Random(seed)) ersetzt das globale random-Modul"""
+    global particle_carry
+    if particle_fraction < 1.0: # Reduzierte Qualität: nur den Anteil ausgeben
+        particle_carry += count * particle_fraction
+        count = int(particle_carry); particle_carry -= count
+        if count == 0:
+            return
     if len(particles) > MAX_PARTICLES - count:
         return
-    for _ in range(count):
-        vel = pygame.Vector2(random.uniform(vel_range[0], vel_range[1]),
-                             random.uniform(vel_range[0], vel_range[1]))
-        r_offset = random.randint(-30, 30); g_offset = random.randint(-30, 30); b_offset = random.randint(-30, 30)
-        p_color = (max(0, min(255, base_color[0] + r_offset)),
-                   max(0, min(255, base_color[1] + g_offset)),
-                   max(0, min(255, base_color[2] + b_offset)))
-        lifetime = random.uniform(life_range[0], life_range[1])
-        particles.append(Particle(pos, vel, p_color, lifetime, radius_range, gravity))
+    rng = rng or random
+    velocities = []; colors = []; lifetimes = []; radii = []
+    for _ in range(count): # Reihenfolge der Zufallszahlen wie bisher, damit Seeds gleiche Effekte liefern
+        velocities.append((rng.uniform(vel_range[0], vel_range[1]), rng.uniform(vel_range[0], vel_range[1])))
+        r_offset = rng.randint(-30, 30); g_offset = rng.randint(-30, 30); b_offset = rng.randint(-30, 30)
+        colors.append((max(0, min(255, base_color[0] + r_offset)),
+                       max(0, min(255, base_color[1] + g_offset)),
+                       max(0, min(255, base_color[2] + b_offset))))
+        lifetimes.append(rng.uniform(life_range[0], life_range[1]))
+        radii.append(rng.uniform(radius_range[0], radius_range[1]))
+    particles.add(pos, velocities, colors, lifetimes, radii, gravity)
 
-def update_and_draw_particles(dt, surface):
-    for i in range(len(particles) - 1, -1, -1):
-        p = particles[i]
-        p.update(dt)
-        if p.lifetime <= 0:
-            particles.pop(i)
+def emit_goal_confetti(screen_width, screen_height, scorer_color, rng=None):
+    """Konfetti-Effekt beim Torjubel"""
+    rng = rng or random
+    confetti_source_y = screen_height / 2 # Etwas über der Mitte
+    for _ in range(60): # Mehr Partikel für Torjubel
+        pos_x = rng.uniform(screen_width * 0.3, screen_width * 0.7) # Breiter gestreut
+        pos_y = rng.uniform(confetti_source_y - 50, confetti_source_y + 50) # Vertikal gestreut
+
+        # Wähle eine Farbe, die die Tor-Farbe oder eine zufällige Tribünenfarbe sein kann
+        if rng.random() < 0.6 and scorer_color: # 60% Chance für Tor-Farbe
+            base_conf_color = scorer_color
         else:
-            p.draw(surface)
+            base_conf_color = rng.choice(SPECTATOR_COLORS)
+
+        emit_particles(1, (pos_x, pos_y), base_conf_color,
+                       vel_range=(-60, 60), life_range=(1.5, 3.0), # Längere Lebensdauer, mehr Streuung
+                       radius_range=(4, 8), gravity=70, rng=rng) # Größere Partikel, stärkere Gravitation
+
+def update_and_draw_particles(dt, surface):
+    """Gibt den Bereich der gezeichneten Partikel zurück (oder None)"""
+    particles.update(dt)
+    return particles.draw(surface)
+
+def update_particles(dt):
+    """Nur altern lassen, ohne zu zeichnen (kosmetischer Pass abgeschaltet)"""
+    particles.update(dt)
 
 def clear_particles():
     particles.clear()
@@ -82,26 +191,28 @@ def clear_particles():
 # --- Spectator Verwaltung ---
 spectator_positions_colors = []
 
-def generate_spectators(screen_width, screen_height, tribune_height, num_spectators):
+def generate_spectators(screen_width, screen_height, tribune_height, num_spectators, rng=None):
+    rng = rng or random
     spectator_positions_colors.clear()
+    background_cache.clear() # Neue Zuschauer: Hintergrund neu zeichnen
     top_tribune_rect = pygame.Rect(0, 0, screen_width, tribune_height)
     for _ in range(num_spectators // 2):
-        pos = (random.randint(top_tribune_rect.left, top_tribune_rect.right),
-               random.randint(top_tribune_rect.top, top_tribune_rect.bottom))
-        color = random.choice(SPECTATOR_COLORS)
+        pos = (rng.randint(top_tribune_rect.left, top_tribune_rect.right),
+               rng.randint(top_tribune_rect.top, top_tribune_rect.bottom))
+        color = rng.choice(SPECTATOR_COLORS)
         spectator_positions_colors.append((pos, color))
     bottom_tribune_rect = pygame.Rect(0, screen_height - tribune_height, screen_width, tribune_height)
     for _ in range(num_spectators // 2):
-        pos = (random.randint(bottom_tribune_rect.left, bottom_tribune_rect.right),
-               random.randint(bottom_tribune_rect.top, bottom_tribune_rect.bottom))
-        color = random.choice(SPECTATOR_COLORS)
+        pos = (rng.randint(bottom_tribune_rect.left, bottom_tribune_rect.right),
+               rng.randint(bottom_tribune_rect.top, bottom_tribune_rect.bottom))
+        color = rng.choice(SPECTATOR_COLORS)
         spectator_positions_colors.append((pos, color))
 
 # --- Drawing-Funktionen ---
 def draw_tribunes_and_spectators(surface, screen_width, screen_height, tribune_height):
     pygame.draw.rect(surface, TRIBUNE_COLOR, (0, 0, screen_width, tribune_height))
     pygame.draw.rect(surface, TRIBUNE_COLOR, (0, screen_height - tribune_height, screen_width, tribune_height))
-    for pos, color in spectator_positions_colors:
+    for pos, color in spectator_positions_colors[::spectator_stride]:
         pygame.draw.circle(surface, color, pos, SPECTATOR_RADIUS)
 
 def draw_field(surface, screen_width, screen_height, tribune_height, goal_width, goal_height):
@@ -119,27 +230,67 @@ def draw_field(surface, screen_width, screen_height, tribune_height, goal_width,
     pygame.draw.line(surface, LINE_COLOR, (goal_width, goal_y_abs_start), (goal_width, goal_y_abs_end), 5)
     pygame.draw.line(surface, LINE_COLOR, (screen_width - goal_width, goal_y_abs_start), (screen_width - goal_width, goal_y_abs_end), 5)
 
+# --- Statischer Hintergrund ---
+# Tribünen, Zuschauer und Spielfeld ändern sich während eines Spiels nicht. draw_background
+# zeichnet sie einmal in eine Surface und blittet danach nur noch diese. Schlüssel sind
+# Bildschirmgröße, Tribünen- und Torgröße, ob das Feld dazugehört (Menü ohne Feld) und
+# spectator_stride; generate_spectators leert den Cache.
+background_cache = {}
+BACKGROUND_CACHE_LIMIT = 4
+
+def draw_background(surface, screen_width, screen_height, tribune_height, goal_width, goal_height, field=True):
+    surface.blit(background_surface(screen_width, screen_height, tribune_height, goal_width, goal_height, field), (0, 0))
+
+def background_surface(screen_width, screen_height, tribune_height, goal_width, goal_height, field=True):
+    """Die gecachte Hintergrund-Surface selbst (z.B. zum Restaurieren einzelner Rechtecke)"""
+    key = (screen_width, screen_height, tribune_height, goal_width, goal_height, field, spectator_stride)
+    background = background_cache.get(key)
+    if background is None:
+        if len(background_cache) >= BACKGROUND_CACHE_LIMIT:
+            background_cache.clear()
+        background = pygame.Surface((screen_width, screen_height))
+        background.fill((0, 0, 0))
+        draw_tribunes_and_spectators(background, screen_width, screen_height, tribune_height)
+        if field:
+            draw_field(background, screen_width, screen_height, tribune_height, goal_width, goal_height)
+        if pygame.display.get_surface() is not None:
+            background = background.convert() # Pixelformat des Fensters: Blit ohne Umrechnung
+        background_cache[key] = background
+    return background
+
 def draw_text(surface, text, font, x, y, color=TEXT_COLOR):
     text_surface = font.render(text, True, color)
     text_rect = text_surface.get_rect(center=(x, y))
-    surface.blit(text_surface, text_rect)
+    return surface.blit(text_surface, text_rect)
+
+# Stempel für die Ballspur: pro (Ballradius, Punktanzahl) einmal vorgerendert.
+# Punkt i von n bekommt Alpha 150 * i / n und Radius 0.8 * Ballradius * i / n.
+trail_stamps = {}
+
+def ball_trail_stamps(ball_radius, num_points):
+    key = (ball_radius, num_points)
+    stamps = trail_stamps.get(key)
+    if stamps is None:
+        stamps = []
+        for i in range(num_points):
+            alpha = max(0, int(150 * (i / num_points)))
+            radius = max(1, int(ball_radius * 0.8 * (i / num_points)))
+            stamp = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, (*BALL_COLOR[:3], alpha), (radius, radius), radius)
+            stamps.append((stamp, radius))
+        trail_stamps[key] = stamps
+    return stamps
 
 def draw_ball_trail(surface, trail, current_ball_radius):
-    num_points = len(trail)
+    """Zeichnet die Spur (Positionen von alt nach neu) und gibt den überdeckten Bereich zurück (oder None)"""
+    num_points = min(len(trail), trail_points)
     if num_points < 2:
-        return
-    for i in range(num_points):
-        pos = trail[i]
-        alpha = max(0, int(150 * (i / num_points)))
-        radius = max(1, int(current_ball_radius * 0.8 * (i / num_points)))
-        if radius >= 1:
-            try:
-                temp_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-                draw_color = (*BALL_COLOR[:3], alpha)
-                pygame.draw.circle(temp_surf, draw_color, (radius, radius), radius)
-                surface.blit(temp_surf, pos - pygame.Vector2(radius, radius))
-            except (ValueError, TypeError):
-                pass
+        return None
+    if num_points < len(trail): # Gekürzte Spur: nur die neuesten Punkte
+        trail = itertools.islice(trail, len(trail) - num_points, None)
+    stamps = ball_trail_stamps(current_ball_radius, num_points)
+    rects = surface.blits([(stamp, (x - radius, y - radius)) for (stamp, radius), (x, y) in zip(stamps, trail)])
+    return rects[0].unionall(rects[1:])
 
 # --- Player Avatar Creation ---
 def create_player_avatar(color, radius):